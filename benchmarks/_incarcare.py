@@ -0,0 +1,34 @@
+"""Încărcarea modulelor integrării pentru benchmark-uri, îndreptate spre un portal local.
+
+Pachetul `custom_components/erovinieta` este încărcat fără a-i rula `__init__.py`, astfel
+încât modulele care nu depind de Home Assistant (api, const, resilience, limitare,
+clienti) pot fi folosite și fără Home Assistant instalat.
+"""
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+PACHET = "erovinieta"
+DIRECTOR_INTEGRARE = Path(__file__).resolve().parent.parent / "custom_components" / "erovinieta"
+
+
+def incarca_integrarea(base_url: str, *module: str):
+    """Încarcă modulele cerute, cu toate URL-urile portalului rescrise spre `base_url`.
+
+    Apelabilă o singură dată per proces: modulele încărcate rețin URL-urile la import.
+    """
+    if PACHET not in sys.modules:
+        pachet = types.ModuleType(PACHET)
+        pachet.__path__ = [str(DIRECTOR_INTEGRARE)]
+        sys.modules[PACHET] = pachet
+
+        const = importlib.import_module(f"{PACHET}.const")
+        original = const.BASE_URL
+        for nume in dir(const):
+            valoare = getattr(const, nume)
+            if nume.startswith(("URL_", "BASE_URL")) and isinstance(valoare, str):
+                setattr(const, nume, valoare.replace(original, base_url.rstrip("/")))
+
+    return [importlib.import_module(f"{PACHET}.{nume}") for nume in module]
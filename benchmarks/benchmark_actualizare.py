@@ -0,0 +1,208 @@
+"""Benchmark de capăt la capăt al unei actualizări a coordinatorului, pe portalul simulat.
+
+Pentru fiecare mărime de flotă măsoară:
+
+- durata `ErovinietaCoordinator._async_update_data`, la prima actualizare (toate etapele)
+  și la una ulterioară (doar etapele scadente, de regulă trecerile de pod);
+- cererile HTTP per actualizare, pe endpoint, și octeții primiți de la portal;
+- sarcinile trimise în executor (thread-uri) în timpul actualizării;
+- timpul de calcul al stării și atributelor senzorilor, pentru întreaga flotă.
+
+Coordinatorul și senzorii depind de Home Assistant, care trebuie să fie instalat
+(`pip install homeassistant`). Rulare, din rădăcina depozitului:
+
+    python benchmarks/benchmark_actualizare.py --vehicule 1 10 100 1000 --detectii 20 --latenta 0.01
+
+API-ul folosește limitatorul de rată al integrării (`LIMITA_CERERI_PE_SECUNDA`, cu rafale
+de `LIMITA_CERERI_RAFALA`), ca în `async_setup`, deci duratele includ așteptarea jetoanelor;
+`--fara-limitator` îl dezactivează, pentru a măsura doar integrarea și portalul simulat.
+
+Cu `--json rezultate.json`, rezultatele sunt salvate pentru comparația între versiuni.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from _incarcare import incarca_integrarea
+from portal_simulat import PortalSimulat
+
+
+class ExecutorNumarat(ThreadPoolExecutor):
+    """Executorul implicit al event loop-ului, cu numărarea sarcinilor primite."""
+
+    def __init__(self):
+        super().__init__(thread_name_prefix="benchmark")
+        self.sarcini = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        self.sarcini += 1
+        return super().submit(fn, *args, **kwargs)
+
+    @property
+    def fire(self) -> int:
+        """Câte thread-uri a pornit executorul până acum."""
+        return len(self._threads)
+
+
+async def masoara_actualizarea(portal, coordinator, executor) -> dict:
+    """O actualizare completă a coordinatorului, cu cererile și sarcinile din executor."""
+    portal.reseteaza_contoarele()
+    sarcini = executor.sarcini
+    start = time.perf_counter()
+    await coordinator._async_update_data()
+    return {
+        "durata_s": round(time.perf_counter() - start, 4),
+        "cereri": sum(portal.cereri.values()),
+        "cereri_pe_endpoint": dict(portal.cereri),
+        "octeti": portal.octeti_trimisi,
+        "conexiuni_noi": len(portal.conexiuni),
+        "sarcini_executor": executor.sarcini - sarcini,
+    }
+
+
+def creeaza_senzorii(sensor_mod, coordinator, config_entry) -> list:
+    """Senzorii pe care i-ar crea platforma pentru datele curente (cei cu atribute bogate)."""
+    senzori = [sensor_mod.DateUtilizatorSensor(coordinator, config_entry)]
+    if coordinator.data.get("transactions"):
+        senzori.append(sensor_mod.RaportTranzactiiSensor(coordinator, config_entry))
+    for vehicul in coordinator.data["paginated_data"]["view"]:
+        entity = vehicul["entity"]
+        date_vehicul = {
+            "vin": entity["vin"],
+            "plate_no": entity["plateNo"],
+            "certificate_series": entity["certificateSeries"],
+        }
+        senzori.extend([
+            sensor_mod.VehiculSensor(coordinator, config_entry, vehicul),
+            sensor_mod.PlataTreceriPodSensor(coordinator, config_entry, **date_vehicul),
+            sensor_mod.TreceriPodSensor(coordinator, config_entry, **date_vehicul),
+            sensor_mod.SoldSensor(coordinator, config_entry, entity["plateNo"]),
+        ])
+    return senzori
+
+
+def verifica_trecerile(sensor_mod, portal, senzori) -> None:
+    """Oprește benchmark-ul dacă senzorii de treceri nu văd toate trecerile simulate.
+
+    Altfel, timpul atributelor ar fi măsurat pe liste goale, fără nicio avertizare.
+    """
+    for senzor in senzori:
+        if isinstance(senzor, sensor_mod.TreceriPodSensor):
+            asteptat = len(portal.detectii[senzor.plate_no])
+            if senzor._calc_state() != asteptat:
+                sys.exit(
+                    f"{senzor.plate_no}: senzorul raportează {senzor._calc_state()} treceri, "
+                    f"portalul simulat are {asteptat}."
+                )
+
+
+def cronometreaza_senzorii(senzori) -> float:
+    """Timpul (secunde) de calcul al stării și atributelor, fără memorare."""
+    start = time.perf_counter()
+    for senzor in senzori:
+        senzor._calc_state()
+        senzor._calc_attributes()
+    return time.perf_counter() - start
+
+
+async def main(argumente) -> None:
+    """Rulează scenariile pentru fiecare mărime de flotă și afișează rezultatele."""
+    try:
+        from homeassistant.core import HomeAssistant
+    except ImportError:
+        sys.exit("Benchmark-ul necesită Home Assistant instalat (pip install homeassistant).")
+
+    portal = PortalSimulat(
+        tranzactii=argumente.tranzactii,
+        latenta=argumente.latenta,
+        jitter=argumente.jitter,
+        rata_erori=argumente.rata_erori,
+    )
+    base_url = await portal.porneste(port=argumente.port)
+    api_mod, clienti_mod, coordinator_mod, sensor_mod, const_mod, limitare_mod = incarca_integrarea(
+        base_url, "api", "clienti", "coordinator", "sensor", "const", "limitare"
+    )
+
+    executor = ExecutorNumarat()
+    asyncio.get_running_loop().set_default_executor(executor)
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="erovinieta-benchmark-"))
+    config_entry = SimpleNamespace(entry_id="benchmark", data={}, options={})
+    gestionar = clienti_mod.GestionarClienti()
+
+    print(
+        f"{'vehicule':>8} {'prima (s)':>10} {'cereri':>7} {'următoare (s)':>14} {'cereri':>7} "
+        f"{'executor':>9} {'senzori':>8} {'atribute (ms)':>14}"
+    )
+    rezultate = []
+    try:
+        for vehicule in argumente.vehicule:
+            portal.genereaza(vehicule, argumente.detectii, argumente.tranzactii)
+            api = api_mod.ErovinietaAsyncAPI(gestionar.sesiune_noua(), "benchmark", "parola")
+            if not argumente.fara_limitator:
+                # ca în async_setup; un limitator nou per flotă, pornit plin
+                api.limitator = limitare_mod.LimitatorRata(
+                    const_mod.LIMITA_CERERI_PE_SECUNDA, const_mod.LIMITA_CERERI_RAFALA
+                )
+            coordinator = coordinator_mod.ErovinietaCoordinator(
+                hass, api, cereri_simultane=argumente.cereri_simultane
+            )
+            try:
+                prima = await masoara_actualizarea(portal, coordinator, executor)
+                urmatoare = await masoara_actualizarea(portal, coordinator, executor)
+                senzori = creeaza_senzorii(sensor_mod, coordinator, config_entry)
+                verifica_trecerile(sensor_mod, portal, senzori)
+                timp_senzori = min(cronometreaza_senzorii(senzori) for _ in range(argumente.repetari))
+            finally:
+                await api.close()
+
+            rezultat = {
+                "vehicule": vehicule,
+                "detectii": vehicule * argumente.detectii,
+                "prima_actualizare": prima,
+                "actualizare_ulterioara": urmatoare,
+                "senzori": len(senzori),
+                "atribute_ms": round(timp_senzori * 1000, 2),
+                "fire_executor": executor.fire,
+                "asteptari_limitator": api.limitator.asteptari if api.limitator is not None else None,
+            }
+            rezultate.append(rezultat)
+            print(
+                f"{vehicule:>8} {prima['durata_s']:>10.3f} {prima['cereri']:>7} "
+                f"{urmatoare['durata_s']:>14.3f} {urmatoare['cereri']:>7} "
+                f"{prima['sarcini_executor'] + urmatoare['sarcini_executor']:>9} "
+                f"{len(senzori):>8} {rezultat['atribute_ms']:>14.2f}"
+            )
+    finally:
+        await gestionar.inchide()
+        await portal.opreste()
+
+    if argumente.json:
+        with open(argumente.json, "w", encoding="utf-8") as fisier:
+            json.dump(rezultate, fisier, indent=2, ensure_ascii=False)
+        print(f"Rezultatele au fost salvate în {argumente.json}.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vehicule", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--detectii", type=int, default=20, help="treceri de pod per vehicul")
+    parser.add_argument("--tranzactii", type=int, default=200)
+    parser.add_argument("--latenta", type=float, default=0.01, help="secunde per cerere")
+    parser.add_argument("--jitter", type=float, default=0.005)
+    parser.add_argument("--rata-erori", type=float, default=0.0, help="fracțiunea de răspunsuri 503")
+    parser.add_argument("--cereri-simultane", type=int, default=4)
+    parser.add_argument("--repetari", type=int, default=3, help="repetări pentru timpul senzorilor")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument(
+        "--fara-limitator", action="store_true", help="fără limitatorul de rată al integrării"
+    )
+    parser.add_argument("--json", help="fișier în care se salvează rezultatele")
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,102 @@
+"""Benchmark: conexiuni noi (handshake-uri) per ciclu, pe măsură ce crește numărul de conturi.
+
+Compară două moduri de a crea clienții, pe un portal local:
+
+- "sesiune proprie": fiecare cont are propriul `aiohttp.ClientSession`, deci propriul
+  pool de conexiuni (comportamentul de dinainte de GestionarClienti);
+- "pool comun": toate conturile primesc sesiuni din `GestionarClienti`, care împart un
+  singur conector, cu câte un cookie jar per cont.
+
+Fiecare conexiune TCP nouă ar însemna, față de portalul real, și un handshake TLS.
+
+Rulare (din rădăcina depozitului):
+
+    python benchmarks/conexiuni_conturi.py --conturi 1 5 10 30 --cicluri 3
+
+Rezultat orientativ: cu 30 de conturi, "sesiune proprie" deschide 120 de conexiuni pe
+ciclu, iar "pool comun" cel mult CONEXIUNI_PORTAL_MAX (8).
+"""
+
+import argparse
+import asyncio
+import time
+
+import aiohttp
+
+from _incarcare import incarca_integrarea
+from portal_simulat import PortalSimulat
+
+VEHICULE_PER_CONT = 6
+
+
+async def ciclu_cont(api):
+    """Cererile unui ciclu de actualizare pentru un cont (fără coordinator)."""
+    await api.get_user_data()
+    await api.get_countries()
+    semafor = asyncio.Semaphore(4)
+
+    async def treceri(entity):
+        async with semafor:
+            await api.get_treceri_pod(entity["vin"], entity["plateNo"], entity["certificateSeries"])
+
+    sarcini = []
+    async for pagina in api.iter_paginated_data():
+        sarcini.extend(asyncio.ensure_future(treceri(item["entity"])) for item in pagina["view"])
+    await asyncio.gather(*sarcini)
+
+
+async def scenariu(api_mod, clienti_mod, mod, conturi, cicluri, pauza, portal):
+    """Rulează `cicluri` actualizări simultane pentru `conturi` conturi; întoarce statistici."""
+    portal.reseteaza_contoarele()
+    conexiuni = portal.conexiuni
+    gestionar = clienti_mod.GestionarClienti() if mod == "pool comun" else None
+    sesiuni = [
+        gestionar.sesiune_noua() if gestionar else aiohttp.ClientSession()
+        for _ in range(conturi)
+    ]
+    apis = [api_mod.ErovinietaAsyncAPI(s, f"cont{i:03d}", "parola") for i, s in enumerate(sesiuni)]
+
+    inceput = time.perf_counter()
+    pe_ciclu = []
+    for _ in range(cicluri):
+        inainte = len(conexiuni)
+        await asyncio.gather(*(ciclu_cont(api) for api in apis))
+        pe_ciclu.append(len(conexiuni) - inainte)
+        await asyncio.sleep(pauza)
+    durata = time.perf_counter() - inceput
+
+    for api in apis:
+        await api.close()
+    if gestionar:
+        await gestionar.inchide()
+    return len(conexiuni), pe_ciclu, durata
+
+
+async def main(argumente):
+    """Pornește portalul local și compară cele două moduri pentru fiecare număr de conturi."""
+    portal = PortalSimulat(vehicule=VEHICULE_PER_CONT, detectii_per_vehicul=5, latenta=0.005)
+    base_url = await portal.porneste(port=argumente.port)
+    api_mod, clienti_mod = incarca_integrarea(base_url, "api", "clienti")
+
+    print(f"{'conturi':>8} {'mod':>16} {'conexiuni':>10} {'pe ciclu':>18} {'durată (s)':>11}")
+    try:
+        for conturi in argumente.conturi:
+            for mod in ("sesiune proprie", "pool comun"):
+                total, pe_ciclu, durata = await scenariu(
+                    api_mod, clienti_mod, mod, conturi, argumente.cicluri, argumente.pauza, portal
+                )
+                print(f"{conturi:>8} {mod:>16} {total:>10} {str(pe_ciclu):>18} {durata:>11.2f}")
+    finally:
+        await portal.opreste()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--conturi", type=int, nargs="+", default=[1, 5, 10, 30])
+    parser.add_argument("--cicluri", type=int, default=3)
+    parser.add_argument(
+        "--pauza", type=float, default=0.2,
+        help="secunde între cicluri; peste keep-alive-ul conectorului, conexiunile se redeschid",
+    )
+    parser.add_argument("--port", type=int, default=8899)
+    asyncio.run(main(parser.parse_args()))
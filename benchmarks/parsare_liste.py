@@ -0,0 +1,87 @@
+"""Benchmark: memoria maximă și durata parsării listelor mari (tranzacții, treceri de pod).
+
+Compară, pe un răspuns sintetic de mărimea dată, două moduri de parsare:
+
+- "complet": textul întreg al răspunsului, apoi `json.loads` (comportamentul de dinainte);
+- "incremental": `ParserLista`, alimentat cu fragmente de 64 KiB, cu elementele reduse
+  la câmpurile folosite de senzori.
+
+Elementele sintetice au, pe lângă câmpurile folosite, și câmpuri pe care integrarea nu
+le citește (ca răspunsurile reale ale portalului). Rulare, din rădăcina depozitului:
+
+    python benchmarks/parsare_liste.py --elemente 1000 10000 50000
+
+Rezultat orientativ, pentru 50000 de treceri (26 MB): memoria maximă scade de la ~86 MiB
+la ~47 MiB, iar parsarea durează ~1,6x mai mult, dar se suprapune cu descărcarea.
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from _incarcare import incarca_integrarea
+from portal_simulat import PortalSimulat
+
+FRAGMENT = 64 * 1024
+
+
+def raspuns_sintetic(elemente: int) -> bytes:
+    """Un răspuns getDetectionsAndPayments cu `elemente` treceri, ca octeți."""
+    portal = PortalSimulat(vehicule=1, detectii_per_vehicul=elemente, tranzactii=0)
+    lista = next(iter(portal.detectii.values()))
+    for i, trecere in enumerate(lista):
+        # câmpuri pe care integrarea nu le folosește
+        trecere.update({
+            "id": i,
+            "detectionId": f"D{i:09d}",
+            "cameraId": i % 40,
+            "imageUrl": f"https://example.invalid/detectii/{i:09d}.jpg",
+            "ocrConfidence": 0.97,
+            "createdBy": "sistem",
+            "lastModifiedDate": 1700000000000 + i,
+        })
+    return json.dumps({"detectionList": lista, "total": elemente}).encode()
+
+
+def masoara(functie):
+    """Durata (secunde) și memoria maximă alocată (MiB) a funcției, plus rezultatul."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    rezultat = functie()
+    durata = time.perf_counter() - start
+    _, maxim = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return durata, maxim / 2**20, rezultat
+
+
+def main(argumente) -> None:
+    """Rulează cele două moduri de parsare pentru fiecare mărime a listei."""
+    const, parsare = incarca_integrarea("http://localhost", "const", "parsare")
+    campuri = const.CAMPURI_TRECERE_POD
+
+    print(f"{'elemente':>9} {'octeți':>11} {'mod':>12} {'durată (s)':>11} {'memorie maximă (MiB)':>21}")
+    for elemente in argumente.elemente:
+        corp = raspuns_sintetic(elemente)
+
+        def complet():
+            # ca înainte: textul întreg, apoi obiectele complete
+            text = corp.decode()
+            return json.loads(text)
+
+        def incremental():
+            parser = parsare.ParserLista("detectionList", campuri)
+            for start in range(0, len(corp), FRAGMENT):
+                parser.alimenteaza(corp[start:start + FRAGMENT])
+            return parser.incheie()
+
+        for mod, functie in (("complet", complet), ("incremental", incremental)):
+            durata, memorie, rezultat = masoara(functie)
+            assert len(rezultat["detectionList"]) == elemente
+            print(f"{elemente:>9} {len(corp):>11} {mod:>12} {durata:>11.3f} {memorie:>21.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--elemente", type=int, nargs="+", default=[1000, 10000, 50000])
+    main(parser.parse_args())
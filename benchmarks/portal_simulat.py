@@ -0,0 +1,254 @@
+"""Portal erovinieta.ro simulat, pentru teste de performanță fără acces la internet.
+
+Servește aceleași endpoint-uri ca portalul real (login, setariUtilizatorPortal,
+getDataPaginated, getCountries, getTransaction, getTransactionDetails,
+getDetectionsAndPayments), cu o flotă sintetică de 1-1000 de vehicule și mii de treceri
+de pod. Latența, jitter-ul și rata de erori 503 sunt configurabile; numărul de cereri
+per endpoint, octeții trimiși și conexiunile TCP noi sunt contorizate.
+
+Poate fi pornit și separat, pentru încercări manuale:
+
+    python benchmarks/portal_simulat.py --vehicule 100 --detectii 20 --port 8900
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from collections import Counter
+
+from aiohttp import web
+
+PREFIX = "/vignettes-portal-web"
+ZI_MS = 86400 * 1000
+
+CATEGORII = ("A", "B", "C", "D", "E")
+PARTENERI = ("CNAIR", "Petrom", "OMV", "MOL", "Web")
+
+
+class PortalSimulat:
+    """Portalul simulat: datele flotei, contoarele și aplicația aiohttp."""
+
+    def __init__(
+        self,
+        vehicule: int = 10,
+        detectii_per_vehicul: int = 20,
+        tranzactii: int = 50,
+        latenta: float = 0.0,
+        jitter: float = 0.0,
+        rata_erori: float = 0.0,
+        seed: int = 1,
+    ):
+        """Inițializează portalul și generează flota."""
+        self.latenta = latenta
+        self.jitter = jitter
+        self.rata_erori = rata_erori
+        self._random = random.Random(seed)
+        self._sesiuni: set[str] = set()
+        self._runner = None
+        self.reseteaza_contoarele()
+        self.genereaza(vehicule, detectii_per_vehicul, tranzactii)
+
+    # -------------------------------------------------------------------------
+    #                 Date sintetice
+    # -------------------------------------------------------------------------
+    def genereaza(self, vehicule: int, detectii_per_vehicul: int, tranzactii: int = 50) -> None:
+        """Generează (din nou) flota, trecerile de pod și tranzacțiile."""
+        acum = int(time.time() * 1000)
+        rnd = self._random
+        self.vehicule = []
+        self.detectii = {}
+        for i in range(vehicule):
+            plate_no = f"B{i:04d}SIM"
+            vin = f"WVWZZZ{i:011d}"
+            start = acum - rnd.randint(1, 300) * ZI_MS
+            self.vehicule.append({
+                "entity": {
+                    "plateNo": plate_no,
+                    "vin": vin,
+                    "certificateSeries": f"CIV{i:06d}",
+                    "tara": 1,
+                },
+                "userDetailsVignettes": [{
+                    "vignetteCategory": rnd.choice(CATEGORII),
+                    "vignetteStartDate": start,
+                    "vignetteStopDate": start + 365 * ZI_MS,
+                }],
+                "detectionPaymentSum": {"soldPeajeNeexpirate": rnd.randint(0, 3)},
+            })
+            self.detectii[plate_no] = [
+                {
+                    "vin": vin,
+                    "plateNo": plate_no,
+                    "detectionTimestamp": acum - rnd.randint(0, 120) * ZI_MS - rnd.randint(0, ZI_MS),
+                    "detectionCategory": rnd.choice(CATEGORII),
+                    "direction": rnd.choice(("Fetești - Cernavodă", "Cernavodă - Fetești")),
+                    "lane": rnd.randint(1, 4),
+                    "value": rnd.choice((13, 26, 48, 97)),
+                    "partner": rnd.choice(PARTENERI),
+                    "paymentMethod": rnd.choice(("card", "SMS", "cash")),
+                    "paymentPlateNo": plate_no,
+                    "taxName": rnd.choice(("O trecere", "Dus-întors", "10 treceri")),
+                    "validUntilTimestamp": acum + rnd.randint(0, 30) * ZI_MS,
+                    # ~10% din treceri sunt neplătite
+                    "paymentStatus": None if rnd.random() < 0.1 else "PAID",
+                }
+                for _ in range(detectii_per_vehicul)
+            ]
+        self.tranzactii = [
+            {
+                "series": f"SIM{n:08d}",
+                "dataTranzactie": acum - rnd.randint(0, 700) * ZI_MS,
+                "valoareTotalaCuTva": round(rnd.uniform(10, 300), 2),
+            }
+            for n in range(tranzactii)
+        ]
+        self.tari = [{"id": 1, "denumire": "ROMANIA"}, {"id": 2, "denumire": "BULGARIA"}]
+
+    def reseteaza_contoarele(self) -> None:
+        """Golește contoarele de cereri, octeți și conexiuni."""
+        self.cereri = Counter()
+        self.octeti_trimisi = 0
+        self.conexiuni = set()
+
+    # -------------------------------------------------------------------------
+    #                 Aplicația aiohttp
+    # -------------------------------------------------------------------------
+    @web.middleware
+    async def _middleware(self, request, handler):
+        """Contorizare, latență simulată și erori aleatoare."""
+        # portul efemer al clientului identifică unic conexiunea TCP
+        self.conexiuni.add(request.transport.get_extra_info("peername"))
+        self.cereri[request.match_info.route.name] += 1
+        if self.latenta or self.jitter:
+            await asyncio.sleep(self.latenta + self._random.uniform(0, self.jitter))
+        if self.rata_erori and self._random.random() < self.rata_erori:
+            return web.Response(status=503, text="Service Unavailable")
+        raspuns = await handler(request)
+        if raspuns.body is not None:
+            self.octeti_trimisi += len(raspuns.body)
+        return raspuns
+
+    def _autentificat(self, request) -> bool:
+        """Verifică sesiunea (JSESSIONID) cererii."""
+        return request.cookies.get("JSESSIONID") in self._sesiuni
+
+    async def _login(self, request):
+        date = await request.json()
+        sesiune = hashlib.sha1(f"{date.get('username')}-{len(self._sesiuni)}".encode()).hexdigest()
+        self._sesiuni.add(sesiune)
+        raspuns = web.json_response({"authenticated": True})
+        raspuns.set_cookie("JSESSIONID", sesiune, path="/")
+        raspuns.set_cookie("_spring_security_remember_me", f"rm-{sesiune}", max_age=14 * 86400, path="/")
+        raspuns.headers["x-csrf-token"] = f"csrf-{sesiune[:8]}"
+        return raspuns
+
+    async def _utilizator(self, request):
+        if not self._autentificat(request):
+            return web.Response(status=401)
+        return web.json_response({
+            "id": 1000,
+            "utilizator": {"nume": "Utilizator Simulat", "email": "simulat@example.com"},
+            "tara": {"denumire": "ROMANIA"},
+        })
+
+    async def _vehicule(self, request):
+        if not self._autentificat(request):
+            return web.Response(status=401)
+        limit = int(request.query.get("limit", 20))
+        page = int(request.query.get("page", 0))
+        view = self.vehicule[page * limit:(page + 1) * limit]
+        return web.json_response({"total": len(self.vehicule), "view": view})
+
+    async def _tari(self, request):
+        etag = '"tari-v1"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.json_response(self.tari, headers={"ETag": etag})
+
+    async def _tranzactii(self, request):
+        if not self._autentificat(request):
+            return web.Response(status=401)
+        date_from = int(request.query.get("dateFrom", 0))
+        date_to = int(request.query.get("dateTo", 2**62))
+        view = [t for t in self.tranzactii if date_from <= t["dataTranzactie"] <= date_to]
+        return web.json_response({"view": view})
+
+    async def _detalii_tranzactie(self, request):
+        if not self._autentificat(request):
+            return web.Response(status=401)
+        series = request.query.get("series")
+        for tranzactie in self.tranzactii:
+            if tranzactie["series"] == series:
+                return web.json_response(tranzactie)
+        return web.json_response({})
+
+    async def _treceri(self, request):
+        date = await request.json()
+        return web.json_response({"detectionList": self.detectii.get(date.get("plateNo"), [])})
+
+    def aplicatie(self) -> web.Application:
+        """Aplicația aiohttp cu toate endpoint-urile portalului."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post(f"{PREFIX}/login", self._login, name="login")
+        app.router.add_get(f"{PREFIX}/rest/setariUtilizatorPortal", self._utilizator, name="utilizator")
+        app.router.add_get(f"{PREFIX}/rest/desktop/home/getDataPaginated", self._vehicule, name="vehicule")
+        app.router.add_get(f"{PREFIX}/rest/anonymous/getCountries", self._tari, name="tari")
+        app.router.add_get(f"{PREFIX}/rest/transaction/getTransaction", self._tranzactii, name="tranzactii")
+        app.router.add_get(
+            f"{PREFIX}/rest/transaction/getTransactionDetails", self._detalii_tranzactie, name="detalii_tranzactie"
+        )
+        app.router.add_post(
+            f"{PREFIX}/rest/anonymous/bridge/detectionsAndPayments/getDetectionsAndPayments",
+            self._treceri,
+            name="treceri_pod",
+        )
+        return app
+
+    async def porneste(self, host: str = "localhost", port: int = 8900) -> str:
+        """Pornește serverul; întoarce URL-ul de bază, de dat lui incarca_integrarea."""
+        self._runner = web.AppRunner(self.aplicatie())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        return f"http://{host}:{port}{PREFIX}"
+
+    async def opreste(self) -> None:
+        """Oprește serverul."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def _serveste(argumente) -> None:
+    """Pornește portalul simulat până la întrerupere (Ctrl+C)."""
+    portal = PortalSimulat(
+        vehicule=argumente.vehicule,
+        detectii_per_vehicul=argumente.detectii,
+        latenta=argumente.latenta,
+        jitter=argumente.jitter,
+        rata_erori=argumente.rata_erori,
+    )
+    base_url = await portal.porneste(port=argumente.port)
+    print(f"Portal simulat pe {base_url} ({argumente.vehicule} vehicule). Ctrl+C pentru oprire.")
+    try:
+        while True:
+            await asyncio.sleep(10)
+            print(json.dumps({"cereri": portal.cereri, "octeti": portal.octeti_trimisi}))
+    finally:
+        await portal.opreste()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vehicule", type=int, default=10)
+    parser.add_argument("--detectii", type=int, default=20, help="treceri de pod per vehicul")
+    parser.add_argument("--latenta", type=float, default=0.0, help="secunde per cerere")
+    parser.add_argument("--jitter", type=float, default=0.0, help="latență suplimentară aleatoare, maximă")
+    parser.add_argument("--rata-erori", type=float, default=0.0, help="fracțiunea de răspunsuri 503")
+    parser.add_argument("--port", type=int, default=8900)
+    try:
+        asyncio.run(_serveste(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -10,19 +10,43 @@ importate "lazy" în funcțiile async.
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
 from typing import TYPE_CHECKING
 
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
+from .const import (
+    DOMAIN,
+    CONF_UPDATE_INTERVAL,
+    DEFAULT_UPDATE_INTERVAL,
+    CONF_CERERI_SIMULTANE,
+    DEFAULT_CERERI_SIMULTANE,
+    CONF_ISTORIC_TRANZACTII,
+    ISTORIC_TRANZACTII_DEFAULT,
+    CONF_ACTUALIZARE_ADAPTIVA,
+    DEFAULT_ACTUALIZARE_ADAPTIVA,
+    CADENTE_OPTIUNI,
+    DEFAULT_CADENTE,
+    DATA_CLIENTI,
+    DATA_LIMITATOR,
+    DATA_PLANIFICATOR,
+    LIMITA_CERERI_PE_SECUNDA,
+    LIMITA_CERERI_RAFALA,
+)
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
 
 
+def _cadente_din_optiuni(entry: ConfigEntry) -> dict[str, int]:
+    """Cadența fiecărei etape a coordinatorului, conform opțiunilor."""
+    return {
+        etapa: entry.options.get(optiune, DEFAULT_CADENTE[etapa])
+        for etapa, optiune in CADENTE_OPTIUNI.items()
+    }
+
+
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 _LOGGER = logging.getLogger(__name__)
@@ -34,6 +58,31 @@ PLATFORMS: list[str] = ["sensor"]
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Setează integrarea folosind configuration.yaml (nu este utilizat pentru această integrare)."""
     _LOGGER.debug("Configurația YAML nu este suportată pentru integrarea CNAIR eRovinieta.")
+
+    from aiohttp.hdrs import USER_AGENT
+    from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+    from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+    from homeassistant.util.ssl import get_default_context
+
+    from .clienti import GestionarClienti
+    from .limitare import LimitatorRata, PlanificatorActualizari
+    from .services import async_setup_services
+
+    # Comune tuturor conturilor: un singur ritm de cereri către portal, o singură planificare
+    # și un singur pool de conexiuni (cu câte un cookie jar per cont)
+    domeniu = hass.data.setdefault(DOMAIN, {})
+    domeniu.setdefault(DATA_LIMITATOR, LimitatorRata(LIMITA_CERERI_PE_SECUNDA, LIMITA_CERERI_RAFALA))
+    domeniu.setdefault(DATA_PLANIFICATOR, PlanificatorActualizari())
+    if DATA_CLIENTI not in domeniu:
+        clienti = GestionarClienti(get_default_context(), {USER_AGENT: SERVER_SOFTWARE})
+        domeniu[DATA_CLIENTI] = clienti
+
+        async def async_inchide_clientii(_event) -> None:
+            await clienti.inchide()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, async_inchide_clientii)
+
+    async_setup_services(hass)
     return True
 
 
@@ -44,28 +93,85 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     )
 
     # Lazy imports to keep package import fast/non-blocking.
-    from .api import ErovinietaAPI
+    from homeassistant.helpers.storage import Store
+
+    from .api import ErovinietaAsyncAPI
     from .coordinator import ErovinietaCoordinator
+    from .const import STORAGE_VERSION, STORAGE_KEY_SESIUNE, SNAPSHOT_SAVE_DELAY
 
-    api = ErovinietaAPI(entry.data["username"], entry.data["password"])
+    # Sesiune proprie (cookie jar separat pentru JSESSIONID), peste conectorul comun al domeniului.
+    session = hass.data[DOMAIN][DATA_CLIENTI].sesiune_noua()
+    api = ErovinietaAsyncAPI(session, entry.data["username"], entry.data["password"])
+    api.limitator = hass.data[DOMAIN][DATA_LIMITATOR]
 
-    try:
-        await hass.async_add_executor_job(api.authenticate)
-    except Exception as e:
-        _LOGGER.error("Eroare la autentificarea utilizatorului %s: %s", entry.data["username"], e)
-        return False
+    # Cookie-urile și token-ul CSRF sunt păstrate într-un fișier privat, ca repornirile
+    # să poată sări peste autentificare. Sunt salvate (grupat) la fiecare schimbare.
+    store_sesiune = Store(
+        hass, STORAGE_VERSION, STORAGE_KEY_SESIUNE.format(entry_id=entry.entry_id), private=True
+    )
+    api.la_schimbarea_sesiunii = lambda: store_sesiune.async_delay_save(
+        api.exporta_sesiunea, SNAPSHOT_SAVE_DELAY
+    )
+    sesiune_salvata = await store_sesiune.async_load()
 
-    update_interval = entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+    async def async_restaureaza_sesiunea() -> bool:
+        """Reîncarcă sesiunea salvată; o eroare înseamnă doar că e nevoie de autentificare."""
+        try:
+            return await api.restaureaza_sesiunea(sesiune_salvata)
+        except Exception as e:
+            _LOGGER.debug("Sesiunea salvată nu a putut fi restaurată: %s", e)
+            return False
 
-    coordinator = ErovinietaCoordinator(hass, api, update_interval)
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except Exception as e:
-        _LOGGER.error("Eroare la actualizarea inițială a datelor: %s", e)
-        return False
+    update_interval = entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+    cereri_simultane = entry.options.get(CONF_CERERI_SIMULTANE, DEFAULT_CERERI_SIMULTANE)
+    istoric_tranzactii = entry.options.get(CONF_ISTORIC_TRANZACTII, ISTORIC_TRANZACTII_DEFAULT)
+
+    coordinator = ErovinietaCoordinator(
+        hass,
+        api,
+        update_interval,
+        istoricul_tranzactiilor=istoric_tranzactii,
+        cereri_simultane=cereri_simultane,
+        actualizare_adaptiva=entry.options.get(CONF_ACTUALIZARE_ADAPTIVA, DEFAULT_ACTUALIZARE_ADAPTIVA),
+        cadente=_cadente_din_optiuni(entry),
+        entry_id=entry.entry_id,
+    )
+    coordinator.planificator = hass.data[DOMAIN][DATA_PLANIFICATOR]
+
+    if await coordinator.async_restore_snapshot():
+        # Entitățile pornesc din datele salvate; autentificarea și actualizarea reală
+        # rulează în fundal, fără să blocheze pornirea Home Assistant.
+        async def async_porneste_in_fundal() -> None:
+            await async_restaureaza_sesiunea()
+            await coordinator.async_refresh()
+
+        entry.async_create_background_task(
+            hass, async_porneste_in_fundal(), f"{DOMAIN}_refresh_{entry.entry_id}"
+        )
+    else:
+        try:
+            if not await async_restaureaza_sesiunea():
+                await api.authenticate()
+        except Exception as e:
+            _LOGGER.error("Eroare la autentificarea utilizatorului %s: %s", entry.data["username"], e)
+            await api.close()
+            return False
+
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception as e:
+            _LOGGER.error("Eroare la actualizarea inițială a datelor: %s", e)
+            await api.close()
+            return False
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {"coordinator": coordinator}
+    coordinator.planificator.inregistreaza(entry.entry_id)
+
+    # Sesiunea portalului este reînnoită în fundal, înainte să expire
+    entry.async_create_background_task(
+        hass, api.mentine_sesiunea(), f"{DOMAIN}_sesiune_{entry.entry_id}"
+    )
 
     try:
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -84,9 +190,22 @@ async def async_update_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     update_interval = entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
 
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    coordinator.update_interval = timedelta(seconds=update_interval)
+    coordinator.interval_baza = update_interval
+    coordinator.actualizare_adaptiva = entry.options.get(
+        CONF_ACTUALIZARE_ADAPTIVA, DEFAULT_ACTUALIZARE_ADAPTIVA
+    )
+    coordinator.ajusteaza_intervalul()
     _LOGGER.info("Intervalul de actualizare a fost setat la %s secunde.", update_interval)
 
+    coordinator.cereri_simultane = entry.options.get(CONF_CERERI_SIMULTANE, DEFAULT_CERERI_SIMULTANE)
+    coordinator.cadente.update(_cadente_din_optiuni(entry))
+
+    istoric_tranzactii = entry.options.get(CONF_ISTORIC_TRANZACTII, ISTORIC_TRANZACTII_DEFAULT)
+    if istoric_tranzactii != coordinator.istoricul_tranzactiilor:
+        # fereastra de istoric s-a schimbat: următorul ciclu descarcă din nou tot istoricul
+        coordinator.istoricul_tranzactiilor = istoric_tranzactii
+        coordinator.forteaza_reconcilierea_tranzactiilor()
+
     await coordinator.async_request_refresh()
     return True
 
@@ -97,5 +216,17 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok and entry.entry_id in hass.data.get(DOMAIN, {}):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DOMAIN][DATA_PLANIFICATOR].elimina(entry.entry_id)
+        await entry_data["coordinator"].api.close()
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Șterge datele salvate pe disc când integrarea este eliminată definitiv."""
+    from homeassistant.helpers.storage import Store
+
+    from .const import STORAGE_VERSION, STORAGE_KEY_DATE, STORAGE_KEY_SESIUNE
+
+    for cheie in (STORAGE_KEY_DATE, STORAGE_KEY_SESIUNE):
+        await Store(hass, STORAGE_VERSION, cheie.format(entry_id=entry.entry_id)).async_remove()
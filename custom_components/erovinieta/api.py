@@ -1,9 +1,16 @@
 """Manager API pentru integrarea CNAIR eRovinieta."""
 
-import requests
+import asyncio
+import json
 import logging
-from datetime import datetime, timedelta
-from json.decoder import JSONDecodeError
+import math
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http.cookies import CookieError, SimpleCookie
+
+import aiohttp
+from yarl import URL
 
 from .const import (
     URL_LOGIN,
@@ -13,22 +20,89 @@ from .const import (
     URL_TRANZACTII,
     URL_DETALII_TRANZACTIE,
     URL_TRECERI_POD,
+    CACHE_TTL_TARI,
+    CACHE_TTL_UTILIZATOR,
+    CAMPURI_TRANZACTIE,
+    CAMPURI_TRECERE_POD,
+    TRANZACTIE_ID_KEYS,
+)
+from .jurnal import rezumat
+from .metrici import Metrici
+from .parsare import ParserLista
+from .resilience import (
+    IntrerupatorCircuit,
+    PoliticaReincercare,
+    PortalIndisponibil,
+    status_reincercabil,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class ErovinietaAPI:
-    TOKEN_VALIDITY_SECONDS = 3600  # Durata de valabilitate a token-ului în secunde
+class ErovinietaAsyncAPI:
+    """Client asincron (aiohttp) pentru portalul erovinieta.ro."""
 
-    def __init__(self, username, password):
-        """Inițializează API-ul Erovinieta."""
+    TOKEN_VALIDITY_SECONDS = 3600  # Durata estimată inițial a sesiunii, în secunde
+    SESSION_EXPIRY_MARGIN = 60  # Sesiunea este considerată expirată cu atât înainte de termen
+    SESSION_REFRESH_MARGIN = 120  # Reînnoirea din fundal are loc cu atât înainte de termen
+    SESSION_MIN_SECONDS = 300  # Limita inferioară pentru durata învățată a sesiunii
+    SESSION_RETRY_DELAY = 60  # Pauză după o reînnoire eșuată în fundal, în secunde
+    REQUEST_TIMEOUT = 10  # Timeout pentru autentificare, în secunde
+    STREAM_CHUNK_SIZE = 64 * 1024  # Fragmentele citite la parsarea incrementală, în octeți
+    PAGE_LIMIT = 20  # Vehicule per pagină în getDataPaginated
+    PAGE_PREFETCH = 4  # Pagini cerute simultan când numărul total este cunoscut
+    MAX_PAGES = 500  # Plasă de siguranță pentru portaluri care ignoră parametrul page
+    # Câmpuri în care portalul poate raporta numărul total de vehicule
+    TOTAL_KEYS = ("total", "totalElements", "totalCount", "count")
+    # TTL per endpoint (cheie = URL fără parametri). Ce lipsește de aici nu este cache-uit.
+    CACHE_TTL = {
+        URL_GET_COUNTRIES: CACHE_TTL_TARI,
+        URL_GET_USER_DATA: CACHE_TTL_UTILIZATOR,
+    }
+
+    # Politici de reîncercare per endpoint (cheie = URL fără parametri); restul folosesc
+    # RETRY_POLICY_DEFAULT. Trecerile de pod se cer per vehicul, deci reîncercările lor
+    # se înmulțesc cu mărimea flotei: le păstrăm puține.
+    RETRY_POLICY_DEFAULT = PoliticaReincercare()
+    RETRY_POLICIES = {
+        URL_TRECERI_POD: PoliticaReincercare(incercari=2, intarziere_maxima=5.0, timeout=15.0),
+        URL_TRANZACTII.split("?")[0]: PoliticaReincercare(incercari=3, timeout=30.0),
+        URL_GET_COUNTRIES: PoliticaReincercare(incercari=4, intarziere_maxima=30.0),
+    }
+    # Întrerupătorul de circuit: după atâtea erori consecutive, portalul nu mai este
+    # contactat timp de BREAKER_OPEN_SECONDS (se servesc datele din cache)
+    BREAKER_THRESHOLD = 5
+    BREAKER_OPEN_SECONDS = 300
+
+    def __init__(self, session: aiohttp.ClientSession, username, password):
+        """Inițializează API-ul Erovinieta.
+
+        Sesiunea aiohttp trebuie să aibă un cookie jar propriu (de ex. creată cu
+        `GestionarClienti.sesiune_noua`), deoarece JSESSIONID este păstrat în el.
+        """
+        self.session = session
         self.username = username
         self.password = password
-        self.session = requests.Session()
         self.token = None
         self.token_acquired_time = None
         self._csrf_token = None
+        # Durata sesiunii, învățată din răspunsurile serverului (secunde)
+        self.durata_sesiune = self.TOKEN_VALIDITY_SECONDS
+        # O singură autentificare la un moment dat; ceilalți apelanți îi folosesc rezultatul.
+        # generatie_sesiune crește la fiecare autentificare reușită.
+        self._login_in_curs = None
+        self.generatie_sesiune = 0
+        self._cereri_in_curs = 0
+        # Apelat (fără argumente) când se schimbă cookie-urile sesiunii, de ex. pentru salvare
+        self.la_schimbarea_sesiunii = None
+        self._sesiune_schimbata = asyncio.Event()
+        # cache_key -> {"data", "expira", "etag", "last_modified"}
+        self._cache = {}
+        self.cache_stats = {"hit": 0, "miss": 0, "revalidat": 0, "expirat": 0}
+        self.intrerupator = IntrerupatorCircuit(self.BREAKER_THRESHOLD, self.BREAKER_OPEN_SECONDS)
+        self.metrici = Metrici()
+        # Limitatorul de rată (LimitatorRata), comun tuturor conturilor; opțional
+        self.limitator = None
 
     # -------------------------------------------------------------------------
     #                 Autentificare
@@ -37,11 +111,41 @@ class ErovinietaAPI:
         """Verifică dacă token-ul este valid și nu a expirat."""
         if self.token is None or self.token_acquired_time is None:
             return False
-        elapsed_time = (datetime.now() - self.token_acquired_time).total_seconds()
-        return elapsed_time < self.TOKEN_VALIDITY_SECONDS - 60
+        return self._varsta_sesiunii() < self.durata_sesiune - self.SESSION_EXPIRY_MARGIN
 
-    def authenticate(self):
-        """Autentifică utilizatorul și stochează cookie-ul JSESSIONID."""
+    def _varsta_sesiunii(self) -> float:
+        """Secundele scurse de la ultima autentificare reușită."""
+        return (datetime.now() - self.token_acquired_time).total_seconds()
+
+    async def authenticate(self):
+        """Autentifică utilizatorul și stochează cookie-ul JSESSIONID.
+
+        Apelurile concurente nu pornesc autentificări separate: toate așteaptă aceeași
+        autentificare în curs și primesc rezultatul ei (sau excepția ei).
+        """
+        if self._login_in_curs is None:
+            self._login_in_curs = asyncio.ensure_future(self._login())
+            self._login_in_curs.add_done_callback(self._login_incheiat)
+        else:
+            _LOGGER.debug("Autentificare deja în curs; așteptăm rezultatul ei.")
+        # shield: anularea unui apelant nu anulează autentificarea folosită de ceilalți
+        await asyncio.shield(self._login_in_curs)
+
+    def _login_incheiat(self, login) -> None:
+        """Eliberează locul autentificării în curs (și consumă excepția, dacă există)."""
+        if self._login_in_curs is login:
+            self._login_in_curs = None
+        if not login.cancelled():
+            login.exception()
+
+    async def _login(self):
+        """Efectuează autentificarea propriu-zisă (un singur apel activ, vezi authenticate)."""
+        self.metrici.autentificari += 1
+        with self.metrici.cronometreaza("autentificare"):
+            await self._trimite_login()
+
+    async def _trimite_login(self):
+        """Trimite cererea de autentificare și preia sesiunea din răspuns."""
         _LOGGER.debug("Inițiem procesul de autentificare pentru utilizatorul %s", self.username)
         payload = {
             "username": self.username,
@@ -49,42 +153,222 @@ class ErovinietaAPI:
             "_spring_security_remember_me": "on"
         }
 
-        self.session.cookies.clear()
-        self._csrf_token = None
+        if self._cereri_in_curs:
+            # Cererile în curs folosesc încă cookie-urile actuale; nu le ștergem de sub ele.
+            # Răspunsul la autentificare suprascrie oricum JSESSIONID.
+            _LOGGER.debug("Autentificare cu %d cereri în curs; păstrăm cookie-urile.", self._cereri_in_curs)
+        else:
+            self.session.cookie_jar.clear()
+            self._csrf_token = None
+
+        # jetonul se așteaptă înainte de permite(): o anulare în timpul așteptării nu
+        # trebuie să lase rezervată proba întrerupătorului
+        if self.limitator is not None:
+            await self.limitator.asteapta()
+        if not self.intrerupator.permite():
+            raise PortalIndisponibil("Portal indisponibil; autentificarea este amânată.")
 
         try:
-            response = self.session.post(URL_LOGIN, json=payload, headers=self._default_headers(), timeout=10)
-            self._update_csrf_from_response(response)
-            _LOGGER.debug("Răspuns la autentificare: %s", response.text)
-            response.raise_for_status()
-        except requests.RequestException as e:
+            async with self.session.post(
+                URL_LOGIN,
+                json=payload,
+                headers=self._default_headers(),
+                timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT),
+            ) as response:
+                self._update_session_from_response(response)
+                durata_cookie = self._durata_din_cookie(response, "JSESSIONID")
+                response_text = await response.text()
+                self.metrici.cereri["login"] += 1
+                self.metrici.octeti_primiti += response.content.total_bytes
+                _LOGGER.debug(
+                    "Răspuns la autentificare: status %s, %s", response.status, rezumat(response_text, fragment=False)
+                )
+                response.raise_for_status()
+                status_code = response.status
+        except asyncio.CancelledError:
+            self.intrerupator.anuleaza_proba()
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             _LOGGER.error("Cerere de autentificare eșuată: %s", e)
+            if isinstance(e, aiohttp.ClientResponseError) and not status_reincercabil(e.status):
+                self.intrerupator.inregistreaza_succes()  # portalul răspunde; datele sunt greșite
+            else:
+                self.intrerupator.inregistreaza_esec(e)
             self.token = None
             self.token_acquired_time = None
             # Reset CSRF token on auth failure to force a clean re-negotiation
             self._csrf_token = None
             raise Exception("Autentificare eșuată.") from e
 
-        if response.status_code == 200:
-            self.token = self.session.cookies.get("JSESSIONID")
+        self.intrerupator.inregistreaza_succes()
+        if status_code == 200:
+            self.token = self._get_cookie("JSESSIONID")
             if not self.token:
                 _LOGGER.error("JSESSIONID nu a fost găsit în cookie-uri.")
                 raise Exception("Autentificare eșuată: JSESSIONID lipsă.")
             self.token_acquired_time = datetime.now()
+            self.generatie_sesiune += 1
+            if durata_cookie:
+                self.durata_sesiune = max(self.SESSION_MIN_SECONDS, durata_cookie)
+                _LOGGER.debug("Durata sesiunii, conform cookie-ului: %d secunde.", self.durata_sesiune)
+            self._sesiune_schimbata.set()
+            self._notifica_schimbarea_sesiunii()
             _LOGGER.info("Autentificarea a reușit pentru %s", self.username)
         else:
-            _LOGGER.error("Eroare la autentificare: %s", response.text)
+            _LOGGER.error("Eroare la autentificare (status %s): %s", status_code, rezumat(response_text))
             raise Exception("Autentificare eșuată.")
 
+    async def _asigura_sesiunea(self, generatie=None):
+        """Garantează o sesiune validă, autentificând cel mult o dată pentru toți apelanții.
+
+        `generatie` este generația sesiunii pe care apelantul o consideră invalidă
+        (respinsă de server sau pe cale să expire). Dacă între timp altă cerere a obținut
+        deja o sesiune nouă, aceasta este refolosită fără o nouă autentificare.
+        """
+        if (
+            self._login_in_curs is None
+            and self.is_authenticated()
+            and (generatie is None or generatie != self.generatie_sesiune)
+        ):
+            return
+        await self.authenticate()
+
+    def exporta_sesiunea(self) -> dict:
+        """Starea sesiunii (cookie-uri, CSRF), pentru a fi păstrată între reporniri."""
+        return {
+            "cookies": [morsel.OutputString() for morsel in self.session.cookie_jar],
+            "csrf": self._csrf_token,
+            "durata_sesiune": self.durata_sesiune,
+        }
+
+    async def restaureaza_sesiunea(self, date) -> bool:
+        """Reîncarcă o sesiune salvată și o validează printr-o cerere ieftină.
+
+        Cookie-ul `_spring_security_remember_me` permite portalului să redeschidă sesiunea
+        chiar dacă JSESSIONID a expirat între timp. Întoarce True dacă sesiunea este
+        utilizabilă; altfel cookie-urile restaurate sunt șterse și este necesară autentificarea.
+        """
+        if not date or not date.get("cookies"):
+            return False
+
+        cookies = SimpleCookie()
+        try:
+            for linie in date["cookies"]:
+                cookies.load(linie)
+        except CookieError as e:
+            _LOGGER.debug("Sesiunea salvată nu poate fi citită: %s", e)
+            return False
+        self.session.cookie_jar.update_cookies(cookies, URL(URL_LOGIN))
+        self._csrf_token = date.get("csrf")
+        self.durata_sesiune = date.get("durata_sesiune", self.durata_sesiune)
+
+        resp_data, status_code, _, _ = await self._do_request(
+            "GET", self._generate_timestamp_url(URL_GET_USER_DATA)
+        )
+        token = self._get_cookie("JSESSIONID")
+        if status_code != 200 or resp_data is None or not token:
+            _LOGGER.debug("Sesiunea salvată nu mai este validă (status %s).", status_code)
+            self.session.cookie_jar.clear()
+            self._csrf_token = None
+            return False
+
+        self.token = token
+        self.token_acquired_time = datetime.now()
+        self.generatie_sesiune += 1
+        self._sesiune_schimbata.set()
+        self._notifica_schimbarea_sesiunii()
+        _LOGGER.info("Sesiunea salvată a fost refolosită pentru %s, fără autentificare.", self.username)
+        return True
+
+    def _notifica_schimbarea_sesiunii(self):
+        """Anunță că starea sesiunii (cookie-uri, CSRF) s-a schimbat."""
+        if self.la_schimbarea_sesiunii is not None:
+            self.la_schimbarea_sesiunii()
+
+    def _invata_durata_din_respingere(self):
+        """Ajustează durata estimată când serverul respinge o sesiune considerată validă."""
+        if self.token_acquired_time is None:
+            return
+        varsta = self._varsta_sesiunii()
+        if varsta < self.durata_sesiune:
+            # media amortizează respingerile izolate (de ex. o repornire a portalului)
+            self.durata_sesiune = max(self.SESSION_MIN_SECONDS, int((self.durata_sesiune + varsta) / 2))
+            _LOGGER.debug(
+                "Sesiune respinsă după %d secunde; durata estimată devine %d secunde.",
+                varsta,
+                self.durata_sesiune,
+            )
+
+    async def mentine_sesiunea(self):
+        """Buclă de fundal care reînnoiește sesiunea cu puțin înainte să expire.
+
+        Astfel, cererile din timpul unei actualizări nu mai plătesc o autentificare.
+        Bucla se oprește doar prin anulare (la descărcarea integrării).
+        """
+        while True:
+            self._sesiune_schimbata.clear()
+            if self.token is None or self.token_acquired_time is None:
+                # nicio sesiune încă; așteptăm prima autentificare
+                await self._sesiune_schimbata.wait()
+                continue
+
+            ramas = self.durata_sesiune - self.SESSION_REFRESH_MARGIN - self._varsta_sesiunii()
+            if ramas > 0:
+                try:
+                    await asyncio.wait_for(self._sesiune_schimbata.wait(), timeout=ramas)
+                    continue  # sesiunea a fost reînnoită între timp; recalculăm termenul
+                except asyncio.TimeoutError:
+                    pass
+
+            _LOGGER.debug("Sesiunea expiră în curând. Reînnoire în fundal...")
+            try:
+                await self._asigura_sesiunea(generatie=self.generatie_sesiune)
+            except Exception as e:
+                _LOGGER.warning("Reînnoirea sesiunii în fundal a eșuat: %s", e)
+                await asyncio.sleep(self.SESSION_RETRY_DELAY)
+
     # -------------------------------------------------------------------------
-    #                 Metode CSRF/Headers
+    #                 Metode Cookie/CSRF/Headers
     # -------------------------------------------------------------------------
 
-    def _update_csrf_from_response(self, response: requests.Response) -> None:
-        """Stochează CSRF token dacă serverul îl furnizează."""
+    def _get_cookie(self, name):
+        """Returnează valoarea unui cookie din jar-ul sesiunii (sau None)."""
+        for cookie in self.session.cookie_jar:
+            if cookie.key == name:
+                return cookie.value
+        return None
+
+    @staticmethod
+    def _durata_din_cookie(response: aiohttp.ClientResponse, name):
+        """Durata de viață (secunde) anunțată de server pentru un cookie, dacă există."""
+        morsel = response.cookies.get(name)
+        if morsel is None:
+            return None
+        if morsel["max-age"]:
+            try:
+                return int(morsel["max-age"])
+            except ValueError:
+                return None
+        if morsel["expires"]:
+            try:
+                expira = parsedate_to_datetime(morsel["expires"])
+            except (TypeError, ValueError):
+                return None
+            return int((expira - datetime.now(timezone.utc)).total_seconds())
+        return None
+
+    def _update_session_from_response(self, response: aiohttp.ClientResponse) -> None:
+        """Stochează CSRF token și JSESSIONID dacă serverul le furnizează."""
         token = response.headers.get("x-csrf-token")
         if token:
             self._csrf_token = token
+        jsessionid = response.cookies.get("JSESSIONID")
+        if jsessionid is not None and jsessionid.value and self.token:
+            # serverul a rotit sesiunea; păstrăm valoarea nouă
+            self.token = jsessionid.value
+        if response.cookies and self.token:
+            # de ex. remember-me rotit; copia salvată trebuie să rămână cea curentă
+            self._notifica_schimbarea_sesiunii()
 
     def _default_headers(self) -> dict:
         """Header-e default pentru portal (XHR)."""
@@ -100,52 +384,221 @@ class ErovinietaAPI:
     # -------------------------------------------------------------------------
     #                 Metodă de bază pentru cererile HTTP
     # -------------------------------------------------------------------------
-    def _request(self, method, url, payload=None, headers=None, reauth=True):
+    async def _request(self, method, url, payload=None, headers=None, reauth=True, lista=None):
         """Execută o cerere HTTP cu verificarea autentificării."""
-        if not self.is_authenticated():
-            _LOGGER.info("Token inexistent sau expirat. Autentificare în curs...")
-            self.authenticate()
+        resp_data, _ = await self._request_with_headers(method, url, payload, headers, reauth, lista=lista)
+        return resp_data
+
+    async def _request_with_headers(
+        self, method, url, payload=None, headers=None, reauth=True, allow_not_modified=False, lista=None
+    ):
+        """Ca _request, dar întoarce și header-ele răspunsului.
 
-        resp_data, status_code, resp_text = self._do_request(method, url, payload, headers)
+        Cu allow_not_modified=True, un răspuns 304 este acceptat și întoarce (None, headers).
+        Cu lista=(cheie, câmpuri), răspunsul este parsat incremental (vezi ParserLista).
+        """
+        if self._login_in_curs is not None or not self.is_authenticated():
+            _LOGGER.info("Token inexistent, expirat sau în curs de reînnoire. Autentificare...")
+            await self._asigura_sesiunea()
 
-        if (status_code in [401, 403] or resp_data is None) and reauth:
-            _LOGGER.info("Token expirat sau răspuns gol. Reîncercăm autentificarea...")
-            self.authenticate()
-            resp_data, status_code, resp_text = self._do_request(method, url, payload, headers)
+        generatie = self.generatie_sesiune
+        resp_data, status_code, resp_text, resp_headers = await self._do_request(
+            method, url, payload, headers, lista
+        )
+        if status_code == 304 and allow_not_modified:
+            return None, resp_headers
+
+        # 401/403 sau pagina de login (200 cu HTML, de regulă după o redirecționare) înseamnă
+        # sesiune respinsă. Un JSON trunchiat sau invalid și erorile de rețea (status None)
+        # nu au legătură cu sesiunea și nu declanșează autentificarea.
+        if reauth and (
+            status_code in [401, 403]
+            or (status_code == 200 and resp_data is None and self._este_pagina_html(resp_headers))
+        ):
+            _LOGGER.info("Sesiune respinsă de server. Reîncercăm autentificarea...")
+            self.metrici.reautentificari += 1
+            self._invata_durata_din_respingere()
+            await self._asigura_sesiunea(generatie=generatie)
+            resp_data, status_code, resp_text, resp_headers = await self._do_request(
+                method, url, payload, headers, lista
+            )
+            if status_code == 304 and allow_not_modified:
+                return None, resp_headers
 
         if status_code != 200 or resp_data is None:
             _LOGGER.error(
-                "Eroare API: [%s] %s. Răspuns gol sau invalid.", status_code, resp_text
+                "Eroare API: [%s] %s. Răspuns gol sau invalid: %s", status_code, url, rezumat(resp_text)
             )
             raise Exception(f"Eroare API: {status_code}, răspuns gol sau invalid.")
 
-        return resp_data
+        return resp_data, resp_headers
+
+    @staticmethod
+    def _este_pagina_html(resp_headers) -> bool:
+        """Răspunsul este o pagină HTML (pagina de login a portalului), nu JSON."""
+        return "text/html" in (resp_headers or {}).get("Content-Type", "").lower()
+
+    def _politica(self, url) -> PoliticaReincercare:
+        """Politica de reîncercare pentru URL-ul dat."""
+        return self.RETRY_POLICIES.get(url.split("?")[0], self.RETRY_POLICY_DEFAULT)
+
+    async def _do_request(self, method, url, payload=None, headers=None, lista=None):
+        """Execută cererea HTTP, cu reîncercări conform politicii endpoint-ului.
+
+        Erorile de rețea, 429 și 5xx sunt reîncercate cu backoff exponențial și jitter.
+        Când întrerupătorul de circuit este deschis, ridică PortalIndisponibil fără a
+        contacta portalul.
+        """
+        politica = self._politica(url)
+        for incercare in range(1, politica.incercari + 1):
+            if self.limitator is not None:
+                await self.limitator.asteapta()  # înainte de permite(), vezi _trimite_login
+            if not self.intrerupator.permite():
+                raise PortalIndisponibil(
+                    f"Portal indisponibil (ultima eroare: {self.intrerupator.ultima_eroare})."
+                )
+            try:
+                rezultat = await self._do_request_o_data(method, url, payload, headers, politica.timeout, lista)
+            except asyncio.CancelledError:
+                self.intrerupator.anuleaza_proba()
+                raise
+
+            status_code = rezultat[1]
+            if not status_reincercabil(status_code):
+                self.intrerupator.inregistreaza_succes()
+                return rezultat
+            self.intrerupator.inregistreaza_esec(status_code or rezultat[2])
+
+            if incercare < politica.incercari:
+                intarziere = politica.intarziere(incercare)
+                self.metrici.reincercari += 1
+                _LOGGER.debug(
+                    "Reîncercăm [%s] %s peste %.1f s (încercarea %d din %d, status %s).",
+                    method, url, intarziere, incercare + 1, politica.incercari, status_code,
+                )
+                await asyncio.sleep(intarziere)
+        return rezultat
+
+    async def _do_request_o_data(self, method, url, payload, headers, timeout, lista=None):
+        """Execută o singură încercare a cererii HTTP.
 
-    def _do_request(self, method, url, payload=None, headers=None):
-        """Execută cererea HTTP."""
+        Cu lista=(cheie, câmpuri[, chei_identitate]), un răspuns 200 este parsat incremental,
+        pe măsură ce sosesc fragmentele, iar elementele listei `cheie` păstrează doar
+        `câmpuri` (vezi ParserLista); textul întors este atunci doar începutul răspunsului
+        (pentru mesajele de eroare).
+        """
+        # endpoint = ultimul segment al căii, de ex. getDataPaginated
+        self.metrici.cereri[url.split("?")[0].rsplit("/", 1)[-1]] += 1
         base_headers = self._default_headers()
         if headers is None:
             headers = {}
         # user headers override defaults
         merged_headers = {**base_headers, **headers}
-        if self.token:
-            self.session.cookies.set("JSESSIONID", self.token, path='/')
 
-        _LOGGER.debug("Cerere HTTP [%s] către %s, payload=%s", method, url, payload)
+        _LOGGER.debug("Cerere HTTP [%s] către %s, payload: %s", method, url, rezumat(payload, fragment=False))
+        self._cereri_in_curs += 1
         try:
-            response = self.session.request(method, url, json=payload, headers=merged_headers, timeout=10)
-            self._update_csrf_from_response(response)
-        except requests.RequestException as e:
-            _LOGGER.error("Cerere HTTP eșuată: %s", e)
-            return None, None, str(e)
+            async with self.session.request(
+                method,
+                url,
+                json=payload,
+                headers=merged_headers,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as response:
+                self._update_session_from_response(response)
+                status_code = response.status
+                resp_headers = response.headers
+                parser = None
+                if lista is not None and status_code == 200:
+                    parser = ParserLista(*lista, encoding=response.charset or "utf-8")
+                    async for fragment in response.content.iter_chunked(self.STREAM_CHUNK_SIZE):
+                        parser.alimenteaza(fragment)
+                    response_text = parser.inceput
+                else:
+                    response_text = await response.text()
+                self.metrici.octeti_primiti += response.content.total_bytes
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # poate fi reîncercată; eroarea finală este jurnalizată de _request_with_headers
+            _LOGGER.debug("Cerere HTTP eșuată: %s", e)
+            return None, None, str(e), {}
+        finally:
+            self._cereri_in_curs -= 1
+
+        _LOGGER.debug(
+            "Răspuns HTTP [%s] de la %s: status %s, %s",
+            method, url, status_code,
+            rezumat(response_text, fragment=False) if parser is None else "parsat incremental",
+        )
+        if status_code != 200:
+            # 304, erori de server (reîncercate) sau respingeri: corpul nu este decodat
+            return None, status_code, response_text, resp_headers
 
         try:
-            data = response.json()
-        except JSONDecodeError:
-            _LOGGER.error("Răspunsul de la server nu este JSON valid. Răspuns text: %s", response.text)
+            data = parser.incheie() if parser is not None else json.loads(response_text)
+        except ValueError:
+            # de ex. pagina de login; _request_with_headers decide dacă este o eroare
+            _LOGGER.debug(
+                "Răspunsul de la %s (status %s) nu este JSON valid: %s", url, status_code, rezumat(response_text)
+            )
             data = None
 
-        return data, response.status_code, response.text
+        return data, status_code, response_text, resp_headers
+
+    # -------------------------------------------------------------------------
+    #                 Cache pentru datele de referință
+    # -------------------------------------------------------------------------
+    async def _cached_get(self, cache_key, url):
+        """GET cu cache TTL per endpoint și revalidare condiționată (ETag/Last-Modified)."""
+        ttl = self.CACHE_TTL.get(cache_key)
+        if ttl is None:
+            return await self._request("GET", url)
+
+        entry = self._cache.get(cache_key)
+        now = time.monotonic()
+        if entry is not None and now < entry["expira"]:
+            self.cache_stats["hit"] += 1
+            _LOGGER.debug("Cache hit pentru %s", cache_key)
+            return entry["data"]
+
+        self.cache_stats["miss"] += 1
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            data, resp_headers = await self._request_with_headers(
+                "GET", url, headers=headers, allow_not_modified=entry is not None
+            )
+        except Exception as e:
+            if entry is None:
+                raise
+            # portalul nu răspunde: datele expirate sunt mai utile decât nimic
+            self.cache_stats["expirat"] += 1
+            _LOGGER.debug("Servim din cache (expirat) %s: %s", cache_key, e)
+            return entry["data"]
+        if data is None and entry is not None:
+            # 304 Not Modified: datele din cache rămân valabile încă un TTL
+            self.cache_stats["revalidat"] += 1
+            _LOGGER.debug("Cache revalidat (304) pentru %s", cache_key)
+            data = entry["data"]
+
+        self._cache[cache_key] = {
+            "data": data,
+            "expira": now + ttl,
+            "etag": resp_headers.get("ETag") or (entry or {}).get("etag"),
+            "last_modified": resp_headers.get("Last-Modified") or (entry or {}).get("last_modified"),
+        }
+        return data
+
+    def invalidate_cache(self, cache_key=None):
+        """Golește cache-ul (integral sau pentru un singur endpoint)."""
+        if cache_key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(cache_key, None)
 
     # -------------------------------------------------------------------------
     #                 Metode Helper
@@ -156,40 +609,120 @@ class ErovinietaAPI:
         separator = "?" if is_first_param else "&"
         return f"{base_url}{separator}timestamp={timestamp}"
 
+    def _extract_total(self, page_data):
+        """Returnează numărul total de înregistrări raportat de o pagină (sau None)."""
+        if not isinstance(page_data, dict):
+            return None
+        for key in self.TOTAL_KEYS:
+            value = page_data.get(key)
+            if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+                return value
+        return None
+
     # -------------------------------------------------------------------------
     #                 Metode Publice (Accesate de integrare)
     # -------------------------------------------------------------------------
-    def get_user_data(self):
+    async def get_user_data(self):
         """Obține detalii despre utilizator."""
         url = self._generate_timestamp_url(URL_GET_USER_DATA)
         _LOGGER.debug("Cerere către URL-ul utilizator: %s", url)
-        return self._request("GET", url)
+        return await self._cached_get(URL_GET_USER_DATA, url)
 
-    def get_paginated_data(self, limit=20, page=0):
+    async def get_paginated_data(self, limit=20, page=0):
         """Obține date paginate."""
         base_url = f"{URL_GET_PAGINATED}?limit={limit}&page={page}"
         url = self._generate_timestamp_url(base_url, is_first_param=False)
         _LOGGER.debug("Cerere către URL-ul paginat: %s", url)
-        return self._request("GET", url)
+        return await self._request("GET", url)
 
-    def get_countries(self):
+    @staticmethod
+    def _vehicule_noi(page_data, vazute: set):
+        """Întoarce pagina cu doar vehiculele nevăzute încă (după număr și VIN) și câte sunt.
+
+        Un portal care ignoră parametrul page întoarce aceleași vehicule pe fiecare pagină;
+        fără deduplicare, ele ar deveni entități cu unique_id duplicat.
+        """
+        view = (page_data or {}).get("view") or []
+        noi = []
+        for item in view:
+            entity = (item or {}).get("entity") or {}
+            cheie = (entity.get("plateNo"), entity.get("vin"))
+            if cheie == (None, None):
+                cheie = json.dumps(item, sort_keys=True, default=str)
+            if cheie not in vazute:
+                vazute.add(cheie)
+                noi.append(item)
+        if len(noi) == len(view):
+            return page_data, len(noi)
+        return {**page_data, "view": noi}, len(noi)
+
+    async def iter_paginated_data(self, limit=None):
+        """Iterează (async) toate paginile din getDataPaginated, în ordine.
+
+        Dacă prima pagină raportează numărul total de vehicule, paginile rămase sunt
+        cerute în avans, câte PAGE_PREFETCH simultan. Altfel, paginile sunt cerute
+        una după alta până la prima pagină incompletă sau fără vehicule noi. Vehiculele
+        deja întâlnite pe paginile anterioare sunt eliminate.
+        """
+        limit = limit or self.PAGE_LIMIT
+        vazute = set()
+        first_page = await self.get_paginated_data(limit=limit, page=0)
+        first_page, _ = self._vehicule_noi(first_page, vazute)
+        yield first_page
+
+        total = self._extract_total(first_page)
+        if total is not None:
+            page_count = min(math.ceil(total / limit), self.MAX_PAGES)
+            if page_count <= 1:
+                return
+            _LOGGER.debug("Portalul raportează %d vehicule (%d pagini).", total, page_count)
+            semafor = asyncio.Semaphore(self.PAGE_PREFETCH)
+
+            async def fetch_page(page):
+                async with semafor:
+                    return await self.get_paginated_data(limit=limit, page=page)
+
+            tasks = [asyncio.ensure_future(fetch_page(page)) for page in range(1, page_count)]
+            try:
+                for task in tasks:
+                    page_data, _ = self._vehicule_noi(await task, vazute)
+                    yield page_data
+            finally:
+                for task in tasks:
+                    task.cancel()
+            return
+
+        view = (first_page or {}).get("view") or []
+        page = 0
+        while len(view) >= limit and page + 1 < self.MAX_PAGES:
+            page += 1
+            page_data = await self.get_paginated_data(limit=limit, page=page)
+            view = (page_data or {}).get("view") or []
+            page_data, noi = self._vehicule_noi(page_data, vazute)
+            if not noi:
+                _LOGGER.debug("Pagina %d nu conține vehicule noi; ne oprim.", page)
+                return
+            yield page_data
+
+    async def get_countries(self):
         """Obține lista țărilor."""
         _LOGGER.debug("Cerere către URL-ul țărilor: %s", URL_GET_COUNTRIES)
-        return self._request("GET", URL_GET_COUNTRIES)
+        return await self._cached_get(URL_GET_COUNTRIES, URL_GET_COUNTRIES)
 
-    def get_tranzactii(self, date_from, date_to):
+    async def get_tranzactii(self, date_from, date_to):
         """Obține lista de tranzacții."""
         url = URL_TRANZACTII.format(dateFrom=date_from, dateTo=date_to)
         _LOGGER.debug("Cerere către URL-ul tranzacțiilor: %s", url)
-        return self._request("GET", url)
+        # tranzacțiile fără identificator rămân întregi, pentru deduplicarea după conținut
+        return await self._request("GET", url, lista=("view", CAMPURI_TRANZACTIE, TRANZACTIE_ID_KEYS))
 
-    def get_detalii_tranzactie(self, series):
+    async def get_detalii_tranzactie(self, series):
         """Obține detalii pentru o tranzacție."""
         url = URL_DETALII_TRANZACTIE.format(series=series)
         _LOGGER.debug("Cerere către URL-ul detaliilor tranzacției: %s", url)
-        return self._request("GET", url)
+        return await self._request("GET", url)
 
-    def get_treceri_pod(self, vin, plate_no, certificate_series, period=4):
+    async def get_treceri_pod(self, vin, plate_no, certificate_series, period=4):
         """Obține istoricul trecerilor de pod."""
         url = URL_TRECERI_POD
         payload = {
@@ -207,5 +740,89 @@ class ErovinietaAPI:
             "Accept": "application/json, text/plain, */*",
             "Content-Type": "application/json;charset=UTF-8",
         }
-        _LOGGER.debug("Cerere către trecerile de pod: %s cu payload: %s", url, payload)
-        return self._request("POST", url, payload=payload, headers=headers)
+        _LOGGER.debug("Cerere către trecerile de pod pentru %s: %s", plate_no, url)
+        return await self._request(
+            "POST", url, payload=payload, headers=headers, lista=("detectionList", CAMPURI_TRECERE_POD)
+        )
+
+    async def close(self):
+        """Închide sesiunea HTTP a clientului."""
+        await self.session.close()
+
+
+class ErovinietaAPI:
+    """Învelitoare sincronă peste ErovinietaAsyncAPI, păstrată pentru compatibilitate.
+
+    Fiecare apel rulează coroutine-ul corespunzător într-un event loop privat. Nu se
+    folosește din Home Assistant (unde se lucrează direct cu ErovinietaAsyncAPI),
+    ci din scripturi sau cod extern care apela vechiul API bazat pe requests.
+    """
+
+    TOKEN_VALIDITY_SECONDS = ErovinietaAsyncAPI.TOKEN_VALIDITY_SECONDS
+
+    def __init__(self, username, password):
+        """Inițializează API-ul Erovinieta."""
+        self.username = username
+        self.password = password
+        self._loop = asyncio.new_event_loop()
+        self._api = None
+
+    def _run(self, method_name, *args, **kwargs):
+        """Rulează sincron o metodă a clientului asincron."""
+        return self._loop.run_until_complete(self._call(method_name, *args, **kwargs))
+
+    async def _call(self, method_name, *args, **kwargs):
+        """Creează (la nevoie) clientul asincron și apelează metoda cerută."""
+        if self._api is None:
+            # sesiunea aiohttp trebuie creată în interiorul event loop-ului
+            self._api = ErovinietaAsyncAPI(aiohttp.ClientSession(), self.username, self.password)
+        return await getattr(self._api, method_name)(*args, **kwargs)
+
+    @property
+    def token(self):
+        """JSESSIONID-ul curent (sau None)."""
+        return self._api.token if self._api else None
+
+    @property
+    def token_acquired_time(self):
+        """Momentul ultimei autentificări reușite (sau None)."""
+        return self._api.token_acquired_time if self._api else None
+
+    def is_authenticated(self) -> bool:
+        """Verifică dacă token-ul este valid și nu a expirat."""
+        return self._api.is_authenticated() if self._api else False
+
+    def authenticate(self):
+        """Autentifică utilizatorul și stochează cookie-ul JSESSIONID."""
+        return self._run("authenticate")
+
+    def get_user_data(self):
+        """Obține detalii despre utilizator."""
+        return self._run("get_user_data")
+
+    def get_paginated_data(self, limit=20, page=0):
+        """Obține date paginate."""
+        return self._run("get_paginated_data", limit=limit, page=page)
+
+    def get_countries(self):
+        """Obține lista țărilor."""
+        return self._run("get_countries")
+
+    def get_tranzactii(self, date_from, date_to):
+        """Obține lista de tranzacții."""
+        return self._run("get_tranzactii", date_from, date_to)
+
+    def get_detalii_tranzactie(self, series):
+        """Obține detalii pentru o tranzacție."""
+        return self._run("get_detalii_tranzactie", series)
+
+    def get_treceri_pod(self, vin, plate_no, certificate_series, period=4):
+        """Obține istoricul trecerilor de pod."""
+        return self._run("get_treceri_pod", vin, plate_no, certificate_series, period=period)
+
+    def close(self):
+        """Închide sesiunea HTTP și event loop-ul privat."""
+        if self._api is not None:
+            self._loop.run_until_complete(self._api.session.close())
+            self._api = None
+        self._loop.close()
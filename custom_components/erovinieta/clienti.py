@@ -0,0 +1,58 @@
+"""Transport HTTP comun tuturor conturilor: un singur pool de conexiuni keep-alive."""
+
+import logging
+
+import aiohttp
+
+from .const import CONEXIUNI_PORTAL_MAX, CONEXIUNI_KEEPALIVE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def creeaza_conector(ssl_context=None) -> aiohttp.TCPConnector:
+    """Conectorul (pool-ul de conexiuni) către portal, reglat pentru reutilizare."""
+    return aiohttp.TCPConnector(
+        limit_per_host=CONEXIUNI_PORTAL_MAX,
+        keepalive_timeout=CONEXIUNI_KEEPALIVE,
+        ttl_dns_cache=300,
+        ssl=ssl_context if ssl_context is not None else True,
+    )
+
+
+class GestionarClienti:
+    """Gestionarul de clienți HTTP al domeniului.
+
+    Toate conturile folosesc același conector, deci conexiunile TCP/TLS deschise pentru
+    un cont sunt refolosite de celelalte (un singur handshake, nu câte unul per cont).
+    Fiecare cont primește însă propria sesiune, cu propriul cookie jar, astfel încât
+    JSESSIONID și remember-me nu se amestecă între conturi.
+    """
+
+    def __init__(self, ssl_context=None, headers=None):
+        """Inițializează gestionarul; conectorul este creat la prima sesiune."""
+        self._ssl_context = ssl_context
+        self._headers = headers or {}
+        self._conector = None
+        self.sesiuni_create = 0
+
+    def sesiune_noua(self) -> aiohttp.ClientSession:
+        """Sesiunea unui cont: cookie jar propriu, conexiuni din pool-ul comun.
+
+        Închiderea sesiunii (ErovinietaAsyncAPI.close) nu închide conectorul comun.
+        """
+        if self._conector is None or self._conector.closed:
+            self._conector = creeaza_conector(self._ssl_context)
+        self.sesiuni_create += 1
+        return aiohttp.ClientSession(
+            connector=self._conector,
+            connector_owner=False,
+            cookie_jar=aiohttp.CookieJar(),
+            headers=self._headers,
+        )
+
+    async def inchide(self) -> None:
+        """Închide conectorul comun (la oprirea Home Assistant)."""
+        if self._conector is not None and not self._conector.closed:
+            _LOGGER.debug("Închidem conexiunile comune către portal.")
+            await self._conector.close()
+        self._conector = None
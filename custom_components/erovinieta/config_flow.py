@@ -2,6 +2,7 @@
 
 from homeassistant import config_entries
 from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
 import voluptuous as vol
 from .const import (
     DOMAIN,
@@ -13,8 +14,17 @@ from .const import (
     MAX_UPDATE_INTERVAL,
     CONF_ISTORIC_TRANZACTII,
     ISTORIC_TRANZACTII_DEFAULT,
+    CONF_CERERI_SIMULTANE,
+    DEFAULT_CERERI_SIMULTANE,
+    MIN_CERERI_SIMULTANE,
+    MAX_CERERI_SIMULTANE,
+    CONF_ACTUALIZARE_ADAPTIVA,
+    DEFAULT_ACTUALIZARE_ADAPTIVA,
+    CADENTE_OPTIUNI,
+    DEFAULT_CADENTE,
+    MAX_CADENTA,
 )
-from .api import ErovinietaAPI
+from .api import ErovinietaAsyncAPI
 
 
 class ErovinietaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -34,9 +44,13 @@ class ErovinietaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             if not errors:
                 # Testăm autentificarea
+                api = ErovinietaAsyncAPI(
+                    async_create_clientsession(self.hass),
+                    user_input[CONF_USERNAME],
+                    user_input[CONF_PASSWORD],
+                )
                 try:
-                    api = ErovinietaAPI(user_input[CONF_USERNAME], user_input[CONF_PASSWORD])
-                    await self.hass.async_add_executor_job(api.authenticate)
+                    await api.authenticate()
                     return self.async_create_entry(
                         title=f"CNAIR eRovinieta ({user_input.get(CONF_USERNAME, 'Utilizator nespecificat')})",
                         data={
@@ -50,6 +64,8 @@ class ErovinietaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     )
                 except Exception:
                     errors["base"] = "authentication_failed"
+                finally:
+                    await api.close()
 
         schema = vol.Schema({
             vol.Required(CONF_USERNAME): str,
@@ -101,6 +117,22 @@ class ErovinietaOptionsFlow(config_entries.OptionsFlow):
             )): vol.All(
                 vol.Coerce(int), vol.Range(min=1, max=10)  # Interval între 1 și 10 ani
             ),
+            vol.Optional(CONF_CERERI_SIMULTANE, default=self._config_entry.options.get(
+                CONF_CERERI_SIMULTANE, DEFAULT_CERERI_SIMULTANE
+            )): vol.All(
+                vol.Coerce(int), vol.Range(min=MIN_CERERI_SIMULTANE, max=MAX_CERERI_SIMULTANE)
+            ),
+            vol.Optional(CONF_ACTUALIZARE_ADAPTIVA, default=self._config_entry.options.get(
+                CONF_ACTUALIZARE_ADAPTIVA, DEFAULT_ACTUALIZARE_ADAPTIVA
+            )): bool,
+            **{
+                vol.Optional(optiune, default=self._config_entry.options.get(
+                    optiune, DEFAULT_CADENTE[etapa]
+                )): vol.All(
+                    vol.Coerce(int), vol.Range(min=MIN_UPDATE_INTERVAL, max=MAX_CADENTA)
+                )
+                for etapa, optiune in CADENTE_OPTIUNI.items()
+            },
         })
 
         return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
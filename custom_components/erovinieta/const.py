@@ -21,6 +21,32 @@ URL_TRANZACTII = (
 CONF_ISTORIC_TRANZACTII = "istoric_tranzactii"  # Cheie pentru istoricul tranzacțiilor
 ISTORIC_TRANZACTII_DEFAULT = 2  # Valoare implicită în ani
 
+# Sincronizare incrementală a tranzacțiilor
+TRANZACTII_RECONCILIERE_INTERVAL = 7 * 86400  # Descărcare completă a istoricului: o dată pe săptămână (secunde)
+TRANZACTII_SUPRAPUNERE = 86400  # Fereastra delta începe cu o zi înaintea ultimei tranzacții văzute (secunde)
+
+# Câmpuri posibile pentru identificatorul și data unei tranzacții, în ordinea preferinței
+TRANZACTIE_ID_KEYS = ("series", "serie", "id", "idTranzactie")
+TRANZACTIE_DATA_KEYS = ("dataTranzactie", "transactionDate", "dataEmitere", "createdDate", "data")
+
+# Câmpurile păstrate din listele mari, parsate incremental (restul sunt ignorate)
+CAMPURI_TRANZACTIE = TRANZACTIE_ID_KEYS + TRANZACTIE_DATA_KEYS + ("valoareTotalaCuTva",)
+CAMPURI_TRECERE_POD = (
+    "vin",  # trecerile sunt atribuite vehiculului după VIN (detectii_vehicul)
+    "plateNo",
+    "detectionTimestamp",
+    "detectionCategory",
+    "direction",
+    "lane",
+    "value",
+    "partner",
+    "paymentMethod",
+    "paymentPlateNo",
+    "taxName",
+    "validUntilTimestamp",
+    "paymentStatus",
+)
+
 # URL pentru obținerea detaliilor unei tranzacții
 URL_DETALII_TRANZACTIE = (
     "https://www.erovinieta.ro/vignettes-portal-web/rest/transaction/getTransactionDetails?"
@@ -31,14 +57,73 @@ URL_DETALII_TRANZACTIE = (
 URL_TRECERI_POD = f"{BASE_URL}/rest/anonymous/bridge/detectionsAndPayments/getDetectionsAndPayments"
 
 
+# Cache pentru datele de referință (secunde). Endpoint-urile dinamice nu sunt cache-uite.
+CACHE_TTL_TARI = 7 * 86400        # Lista de țări: practic statică
+CACHE_TTL_UTILIZATOR = 6 * 3600   # Setările utilizatorului
+
+# Atributele senzorilor de treceri pod: doar cele mai recente N treceri (istoricul complet
+# este disponibil prin serviciul erovinieta.istoric_treceri_pod)
+TRECERI_POD_ATRIBUTE_MAX = 10
+SERVICE_ISTORIC_TRECERI_POD = "istoric_treceri_pod"
+ATTR_NUMAR_INMATRICULARE = "numar_inmatriculare"
+
+# Persistența ultimului set de date (pornire instantanee)
+STORAGE_VERSION = 1
+STORAGE_KEY_DATE = f"{DOMAIN}.date.{{entry_id}}"
+STORAGE_KEY_SESIUNE = f"{DOMAIN}.sesiune.{{entry_id}}"  # Cookie-uri și CSRF (fișier privat)
+SNAPSHOT_SAVE_DELAY = 10  # Secunde de grupare a scrierilor pe disc
+
+# Limitare comună tuturor conturilor (hass.data[DOMAIN][DATA_LIMITATOR] / [DATA_PLANIFICATOR])
+DATA_LIMITATOR = "limitator"
+DATA_PLANIFICATOR = "planificator"
+LIMITA_CERERI_PE_SECUNDA = 4  # Ritmul mediu al cererilor către portal, pentru toate conturile
+LIMITA_CERERI_RAFALA = 8  # Câte cereri pot pleca imediat, înainte de limitare
+DATA_CLIENTI = "clienti"  # Gestionarul de clienți HTTP (conector comun tuturor conturilor)
+CONEXIUNI_PORTAL_MAX = 8  # Conexiuni simultane către portal, pentru toate conturile
+CONEXIUNI_KEEPALIVE = 60  # Secunde în care o conexiune liberă rămâne deschisă pentru refolosire
+
+
 # Configurația cheilor pentru ConfigFlow
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 CONF_UPDATE_INTERVAL = "update_interval"
+CONF_CERERI_SIMULTANE = "cereri_simultane"  # Câte vehicule interogăm în paralel pentru treceri de pod
+CONF_ACTUALIZARE_ADAPTIVA = "actualizare_adaptiva"  # Intervalul se adaptează la ce este în așteptare
+# Cadența fiecărei clase de date (secunde). Trecerile de pod urmează intervalul de actualizare.
+CONF_CADENTA_VEHICULE = "cadenta_vehicule"
+CONF_CADENTA_TRANZACTII = "cadenta_tranzactii"
+CONF_CADENTA_TARI = "cadenta_tari"
+CONF_CADENTA_UTILIZATOR = "cadenta_utilizator"
 
 # Valori implicite
 DEFAULT_UPDATE_INTERVAL = 3600  # 1 oră (în secunde)
 MIN_UPDATE_INTERVAL = 300       # Minim 5 minute (în secunde)
 MAX_UPDATE_INTERVAL = 86400     # Maxim 1 zi (în secunde)
 DEFAULT_TRANSACTION_HISTORY_YEARS = 2
+DEFAULT_CERERI_SIMULTANE = 4
+MIN_CERERI_SIMULTANE = 1
+MAX_CERERI_SIMULTANE = 16
+DEFAULT_ACTUALIZARE_ADAPTIVA = True
+# Etapă coordinator -> opțiune și cadență implicită (secunde)
+CADENTE_OPTIUNI = {
+    "vehicule": CONF_CADENTA_VEHICULE,
+    "tranzactii": CONF_CADENTA_TRANZACTII,
+    "tari": CONF_CADENTA_TARI,
+    "utilizator": CONF_CADENTA_UTILIZATOR,
+}
+DEFAULT_CADENTE = {
+    "vehicule": 3600,          # 1 oră
+    "tranzactii": 86400,       # 1 zi
+    "tari": 7 * 86400,         # 1 săptămână
+    "utilizator": 6 * 3600,    # 6 ore
+}
+MAX_CADENTA = 30 * 86400       # Maxim 30 de zile
+CADENTA_TOLERANTA = 60         # O etapă este scadentă cu până la un minut înainte de termen
+
+# Actualizare adaptivă (secunde). Intervalul rezultat rămâne între MIN și MAX_UPDATE_INTERVAL.
+ADAPTIV_PRAG_EXPIRARE = 3 * 86400      # Vignietă care expiră în mai puțin de 3 zile
+ADAPTIV_INTERVAL_EXPIRARE = 1800       # ... interogată cel mult la 30 de minute
+ADAPTIV_FEREASTRA_RESTANTE = 86400     # Treceri neplătite din ultimele 24h (termenul de plată)
+ADAPTIV_INTERVAL_RESTANTE = 600        # ... interogate cel mult la 10 minute
+ADAPTIV_FACTOR_INACTIV = 3             # Nimic în așteptare: intervalul de bază x 3
 
@@ -1,11 +1,40 @@
 # custom_components/erovinieta/coordinator.py
 
+import asyncio
 from datetime import datetime, timedelta
+import hashlib
+import json
 import logging
+import time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.core import HomeAssistant
-from .const import DOMAIN, DEFAULT_UPDATE_INTERVAL, ISTORIC_TRANZACTII_DEFAULT
-from .api import ErovinietaAPI  # Asigură-te că această linie este prezentă
+from homeassistant.helpers.storage import Store
+from .const import (
+    DOMAIN,
+    DEFAULT_UPDATE_INTERVAL,
+    ISTORIC_TRANZACTII_DEFAULT,
+    DEFAULT_CERERI_SIMULTANE,
+    TRANZACTII_RECONCILIERE_INTERVAL,
+    TRANZACTII_SUPRAPUNERE,
+    STORAGE_VERSION,
+    STORAGE_KEY_DATE,
+    SNAPSHOT_SAVE_DELAY,
+    DEFAULT_ACTUALIZARE_ADAPTIVA,
+    MIN_UPDATE_INTERVAL,
+    MAX_UPDATE_INTERVAL,
+    ADAPTIV_PRAG_EXPIRARE,
+    ADAPTIV_INTERVAL_EXPIRARE,
+    ADAPTIV_FEREASTRA_RESTANTE,
+    ADAPTIV_INTERVAL_RESTANTE,
+    ADAPTIV_FACTOR_INACTIV,
+    DEFAULT_CADENTE,
+    CADENTA_TOLERANTA,
+    TRANZACTIE_ID_KEYS,
+    TRANZACTIE_DATA_KEYS,
+)
+from .api import ErovinietaAsyncAPI
+from .jurnal import rezumat
+from .resilience import PortalIndisponibil
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,15 +49,64 @@ def safe_get(value, default=None):
         return default
     return value
 
+
+def tranzactie_cheie(tranzactie: dict) -> str:
+    """Returnează o cheie stabilă pentru deduplicarea unei tranzacții."""
+    for key in TRANZACTIE_ID_KEYS:
+        value = tranzactie.get(key)
+        if value not in (None, ""):
+            return f"{key}:{value}"
+    # fără identificator explicit: folosim conținutul complet
+    return "json:" + json.dumps(tranzactie, sort_keys=True, default=str)
+
+
+def tranzactie_timestamp(tranzactie: dict) -> int | None:
+    """Returnează momentul tranzacției în milisecunde (sau None dacă nu se poate determina)."""
+    for key in TRANZACTIE_DATA_KEYS:
+        value = tranzactie.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+            return int(value)
+        if isinstance(value, str) and value:
+            try:
+                return int(datetime.fromisoformat(value).timestamp() * 1000)
+            except ValueError:
+                continue
+    return None
+
+
+def _detectii_cu_vin(detection_list: list[dict], vin: str) -> list[dict]:
+    """Păstrează doar trecerile de pod înregistrate pe VIN-ul dat."""
+    return [detection for detection in detection_list if detection.get("vin") == vin]
+
+
+def _amprenta(valoare) -> str:
+    """Calculează o amprentă scurtă și stabilă pentru o structură JSON."""
+    serializat = json.dumps(valoare, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.blake2b(serializat.encode(), digest_size=16).hexdigest()
+
+
+# Etapele cu cadență proprie: cheia din coordinator.data și descrierea pentru mesajele de eroare
+ETAPE = {
+    "utilizator": ("user_data", "datelor utilizator"),
+    "vehicule": ("paginated_data", "datelor vehicule"),
+    "tari": ("countries_data", "listei de țări"),
+    "tranzactii": ("transactions", "tranzacțiilor"),
+}
+
+
 class ErovinietaCoordinator(DataUpdateCoordinator):
     """Coordinator pentru gestionarea datelor din API-ul Erovinieta."""
 
     def __init__(
         self,
         hass: HomeAssistant,
-        api: object,
+        api: ErovinietaAsyncAPI,
         update_interval: int = DEFAULT_UPDATE_INTERVAL,
         istoricul_tranzactiilor: int = ISTORIC_TRANZACTII_DEFAULT,
+        cereri_simultane: int = DEFAULT_CERERI_SIMULTANE,
+        actualizare_adaptiva: bool = DEFAULT_ACTUALIZARE_ADAPTIVA,
+        cadente: dict[str, int] | None = None,
+        entry_id: str | None = None,
     ):
         """Inițializează coordinatorul Erovinieta."""
         super().__init__(
@@ -41,84 +119,517 @@ class ErovinietaCoordinator(DataUpdateCoordinator):
         self.data = {}
         self.istoricul_tranzactiilor = istoricul_tranzactiilor
         self.vehicule_data: list[dict] = []
+        # Crește la fiecare publicare de date noi; senzorii își memorează calculele pe generație
+        self.generatie = 0
+        # Numărul maxim de cereri de treceri pod aflate simultan în zbor
+        self.cereri_simultane = cereri_simultane
+        # Intervalul configurat (secunde); cu actualizare adaptivă, update_interval pornește de la el
+        self.interval_baza = update_interval
+        self.actualizare_adaptiva = actualizare_adaptiva
+        # Cadența fiecărei etape (secunde) și momentul ultimei rulări reușite (monotonic)
+        self.cadente: dict[str, int] = {**DEFAULT_CADENTE, **(cadente or {})}
+        self._ultima_rulare: dict[str, float] = {}
+        # Etapele scadente care nu au adus date noi în ciclul curent
+        self._etape_esuate: set[str] = set()
 
-    async def _async_update_data(self) -> dict:
-        """Actualizează datele periodic prin apelurile către API."""
-        _LOGGER.debug("Începem actualizarea datelor în ErovinietaCoordinator...")
+        # Magazin local de tranzacții (cheie -> tranzacție) și marcajul de sincronizare
+        self._tranzactii: dict[str, dict] = {}
+        self._tranzactii_marcaj: int | None = None  # cea mai nouă tranzacție văzută (ms)
+        self._ultima_reconciliere: datetime | None = None
+
+        # Indexuri reconstruite o dată per actualizare, pentru căutări O(1) în senzori
+        self.view_by_plate: dict[str, dict] = {}
+        self.detectii_by_plate: dict[str, list[dict]] = {}
+        self.detectii_by_vehicul: dict[tuple[str, str], list[dict]] = {}  # (VIN, număr) -> treceri
+        self.tari_by_id: dict = {}
+        # Amprente ieftine ale datelor: per vehicul și pentru datele la nivel de cont
+        self.amprente: dict[str, str] = {}
+        self.amprenta_cont: str | None = None
+
+        # Reîmprospătări individuale de vehicul aflate în curs (număr -> task), pentru deduplicare
+        self._vehicule_in_curs: dict[str, asyncio.Task] = {}
+
+        # Ultimul set de date reușit, persistat pentru pornire instantanee
+        self._store: Store | None = (
+            Store(hass, STORAGE_VERSION, STORAGE_KEY_DATE.format(entry_id=entry_id))
+            if entry_id
+            else None
+        )
+        self.entry_id = entry_id
+        # Planificatorul comun al domeniului (PlanificatorActualizari), setat la configurare
+        self.planificator = None
+
+    # -------------------------------------------------------------------------
+    #                 Indexuri
+    # -------------------------------------------------------------------------
+    def _rebuild_indexes(self) -> None:
+        """Reconstruiește indexurile pe număr de înmatriculare, VIN și ID de țară."""
+        data = self.data or {}
+        view_by_plate = {}
+        for item in safe_get((data.get("paginated_data") or {}).get("view"), []):
+            entity = (item or {}).get("entity") or {}
+            if entity.get("plateNo"):
+                view_by_plate.setdefault(entity["plateNo"], item)
+
+        # Trecerile sunt deja partiționate pe vehicul (cheie: număr de înmatriculare);
+        # filtrarea pe VIN se face aici, o singură dată, nu la fiecare citire din senzori
+        detectii_by_plate = dict(safe_get(data.get("treceri_pod"), {}))
+        detectii_by_vehicul = {}
+        for plate_no, detection_list in detectii_by_plate.items():
+            vin = ((view_by_plate.get(plate_no) or {}).get("entity") or {}).get("vin")
+            if vin:
+                detectii_by_vehicul[(vin, plate_no)] = _detectii_cu_vin(detection_list, vin)
+
+        tari_by_id = {}
+        countries = data.get("countries_data")
+        if isinstance(countries, list):
+            for country in countries:
+                if isinstance(country, dict) and country.get("id") is not None:
+                    tari_by_id.setdefault(country["id"], country)
 
+        self.view_by_plate = view_by_plate
+        self.detectii_by_plate = detectii_by_plate
+        self.detectii_by_vehicul = detectii_by_vehicul
+        self.tari_by_id = tari_by_id
+
+        self.amprente = {plate_no: self._amprenta_vehicul(plate_no) for plate_no in view_by_plate}
+        self.amprenta_cont = _amprenta({
+            "user_data": data.get("user_data"),
+            "transactions": data.get("transactions"),
+            "countries_data": data.get("countries_data"),
+        })
+
+    def _amprenta_vehicul(self, plate_no: str) -> str:
+        """Amprenta datelor unui vehicul: element din view (cu vigneta), țara și trecerile de pod."""
+        view = self.view_by_plate.get(plate_no)
+        tara = ((view or {}).get("entity") or {}).get("tara")
+        return _amprenta({
+            "view": view,
+            "tara": self.tari_by_id.get(tara) if tara is not None else None,
+            "treceri_pod": self.detectii_by_plate.get(plate_no),
+        })
+
+    def amprenta(self, plate_no: str | None) -> str | None:
+        """Returnează amprenta vehiculului sau, fără număr, pe cea a datelor de cont."""
+        if plate_no is None:
+            return self.amprenta_cont
+        return self.amprente.get(plate_no)
+
+    def detectii_vehicul(self, vin: str, plate_no: str) -> list[dict]:
+        """Returnează trecerile de pod ale unui vehicul (potrivire pe VIN și număr).
+
+        Perechile (VIN, număr) din lista de vehicule sunt indexate la fiecare actualizare,
+        deci căutarea este O(1); o pereche neindexată este filtrată din partiția numărului.
+        """
+        detectii = self.detectii_by_vehicul.get((vin, plate_no))
+        if detectii is None:
+            detectii = _detectii_cu_vin(self.detectii_by_plate.get(plate_no, []), vin)
+        return detectii
+
+    # -------------------------------------------------------------------------
+    #                 Actualizare adaptivă
+    # -------------------------------------------------------------------------
+    def _calculeaza_intervalul(self) -> tuple[int, str]:
+        """Alege intervalul până la următoarea actualizare și motivul alegerii.
+
+        Interogăm mai des cât timp o rovinietă este aproape de expirare sau există treceri
+        neplătite în termenul de plată, și mult mai rar când nu este nimic în așteptare.
+        """
+        baza = self.interval_baza
+        if not self.actualizare_adaptiva:
+            return baza, "fix"
+
+        now_ms = int(time.time() * 1000)
+        interval, motiv = None, None
+
+        for plate_no, detection_list in self.detectii_by_plate.items():
+            if any(
+                detection.get("paymentStatus") is None
+                and now_ms - (detection.get("detectionTimestamp") or 0) <= ADAPTIV_FEREASTRA_RESTANTE * 1000
+                for detection in detection_list
+            ):
+                interval, motiv = min(baza, ADAPTIV_INTERVAL_RESTANTE), f"treceri neplătite ({plate_no})"
+                break
+
+        if interval is None:
+            for plate_no, item in self.view_by_plate.items():
+                vignettes = (item or {}).get("userDetailsVignettes") or []
+                stop_ts = vignettes[0].get("vignetteStopDate") if vignettes else None
+                if stop_ts and 0 <= stop_ts - now_ms <= ADAPTIV_PRAG_EXPIRARE * 1000:
+                    interval, motiv = min(baza, ADAPTIV_INTERVAL_EXPIRARE), f"rovinietă aproape de expirare ({plate_no})"
+                    break
+
+        if interval is None:
+            interval, motiv = baza * ADAPTIV_FACTOR_INACTIV, "nimic în așteptare"
+
+        return max(MIN_UPDATE_INTERVAL, min(MAX_UPDATE_INTERVAL, interval)), motiv
+
+    def ajusteaza_intervalul(self) -> None:
+        """Aplică intervalul calculat pentru următoarea actualizare programată."""
+        interval, motiv = self._calculeaza_intervalul()
+        if self.planificator is not None and self.entry_id:
+            # actualizările conturilor sunt eșalonate, nu pornesc toate odată
+            interval = round(self.planificator.interval_aliniat(self.entry_id, interval))
+        if self.update_interval != timedelta(seconds=interval):
+            _LOGGER.debug("Următoarea actualizare peste %d s (%s).", interval, motiv)
+        self.update_interval = timedelta(seconds=interval)
+
+    # -------------------------------------------------------------------------
+    #                 Persistența datelor
+    # -------------------------------------------------------------------------
+    async def async_restore_snapshot(self) -> bool:
+        """Încarcă ultimul set de date salvat pe disc. Returnează True dacă există."""
+        if self._store is None:
+            return False
         try:
-            # 1. Date utilizator (folosind endpoint-ul corect)
-            try:
-                user_data = await self.hass.async_add_executor_job(self.api.get_user_data)
-                _LOGGER.debug("Răspuns brut get_user_data: %s", user_data)
+            snapshot = await self._store.async_load()
+        except Exception as e:
+            _LOGGER.warning("Datele salvate nu au putut fi încărcate: %s", e)
+            return False
+        if not isinstance(snapshot, dict) or not snapshot.get("data"):
+            return False
 
-                # Verificare date utilizator
-                nume = safe_get(user_data.get("utilizator", {}).get("nume"), "N/A")
-                email = safe_get(user_data.get("utilizator", {}).get("email"), "N/A")
-                _LOGGER.debug("Nume utilizator: %s, Email: %s", nume, email)
-            except Exception as e:
-                _LOGGER.error("Eroare la obținerea datelor utilizator: %s", e)
-                user_data = {}
+        self.data = snapshot["data"]
+        if "treceri_pod" not in self.data:
+            # format vechi: o singură listă comasată pentru toate vehiculele
+            treceri_pod = {}
+            for detection in safe_get(self.data.pop("detectionList", None), []):
+                treceri_pod.setdefault(detection.get("plateNo"), []).append(detection)
+            self.data["treceri_pod"] = treceri_pod
+        view = safe_get((self.data.get("paginated_data") or {}).get("view"), [])
+        self.vehicule_data = [safe_get(vehicul.get("entity"), {}) for vehicul in view]
+        self._rebuild_indexes()
+        self.generatie += 1
+        self.ajusteaza_intervalul()
 
-            # 2. Date paginate: vehicule
-            try:
-                paginated_data = await self.hass.async_add_executor_job(self.api.get_paginated_data)
-                _LOGGER.debug("Răspuns brut get_paginated_data: %s", paginated_data)
+        # Refacem magazinul de tranzacții, ca sincronizarea să continue incremental
+        self._tranzactii = {
+            tranzactie_cheie(tranzactie): tranzactie
+            for tranzactie in self.data.get("transactions", [])
+            if isinstance(tranzactie, dict)
+        }
+        self._tranzactii_marcaj = snapshot.get("tranzactii_marcaj")
+        ultima_reconciliere = snapshot.get("ultima_reconciliere")
+        self._ultima_reconciliere = (
+            datetime.fromisoformat(ultima_reconciliere) if ultima_reconciliere else None
+        )
 
-                vehicule_data = safe_get(paginated_data.get("view"), [])
-                self.vehicule_data = [safe_get(vehicul.get("entity"), {}) for vehicul in vehicule_data]
-            except Exception as e:
-                _LOGGER.error("Eroare la obținerea datelor vehicule: %s", e)
-                paginated_data = {}
+        _LOGGER.info(
+            "Au fost încărcate datele salvate la %s (%d vehicule).",
+            snapshot.get("salvat_la", "N/A"), len(self.vehicule_data),
+        )
+        return True
 
-            # 3. Lista de țări
-            try:
-                countries_data = await self.hass.async_add_executor_job(self.api.get_countries)
-                _LOGGER.debug("Răspuns brut get_countries: %s", countries_data)
-            except Exception as e:
-                _LOGGER.error("Eroare la obținerea listei de țări: %s", e)
-                countries_data = []
-
-            # 4. Treceri de pod
-            treceri_pod_data = {"detectionList": []}
-            for vehicul in self.vehicule_data:
-                vin = safe_get(vehicul.get("vin"), "N/A")
-                plate_no = safe_get(vehicul.get("plateNo"), "N/A")
-                certificate_series = safe_get(vehicul.get("certificateSeries"), "N/A")
-                if vin == "N/A" or plate_no == "N/A" or certificate_series == "N/A":
-                    _LOGGER.warning("Date incomplete pentru vehicul: VIN=%s, PlateNo=%s", vin, plate_no)
-                    continue
-
-                try:
-                    vehicul_treceri = await self.hass.async_add_executor_job(
-                        self.api.get_treceri_pod, vin, plate_no, certificate_series
-                    )
-                    detection_list = safe_get(vehicul_treceri.get("detectionList"), [])
-                    treceri_pod_data["detectionList"].extend(detection_list)
-                except Exception as e:
-                    _LOGGER.error("Eroare la obținerea trecerilor pentru %s: %s", plate_no, e)
-
-            # 5. Tranzacții
+    def _snapshot(self) -> dict:
+        """Construiește conținutul salvat pe disc."""
+        return {
+            "data": self.data,
+            "tranzactii_marcaj": self._tranzactii_marcaj,
+            "ultima_reconciliere": (
+                self._ultima_reconciliere.isoformat() if self._ultima_reconciliere else None
+            ),
+            "salvat_la": datetime.now().isoformat(),
+        }
+
+    async def async_remove_snapshot(self) -> None:
+        """Șterge datele salvate (la eliminarea integrării)."""
+        if self._store is not None:
+            await self._store.async_remove()
+
+    async def _async_fetch_treceri_vehicul(
+        self, vehicul: dict, semafor: asyncio.Semaphore
+    ) -> list[dict] | None:
+        """Obține trecerile de pod pentru un singur vehicul.
+
+        Erorile sunt izolate per vehicul: un vehicul care eșuează întoarce None (iar
+        apelantul își păstrează ultimele treceri cunoscute) și nu afectează restul flotei.
+        """
+        vin = safe_get(vehicul.get("vin"), "N/A")
+        plate_no = safe_get(vehicul.get("plateNo"), "N/A")
+        certificate_series = safe_get(vehicul.get("certificateSeries"), "N/A")
+        if vin == "N/A" or plate_no == "N/A" or certificate_series == "N/A":
+            _LOGGER.warning("Date incomplete pentru vehicul: VIN=%s, PlateNo=%s", vin, plate_no)
+            return []
+
+        async with semafor:
+            start = time.monotonic()
             try:
-                date_from = int((datetime.now() - timedelta(days=self.istoricul_tranzactiilor * 365)).timestamp() * 1000)
-                date_to = int(datetime.now().timestamp() * 1000)
-                transactions = await self.hass.async_add_executor_job(self.api.get_tranzactii, date_from, date_to)
-                tranzactii_lista = safe_get(transactions.get("view"), [])
+                vehicul_treceri = await self.api.get_treceri_pod(vin, plate_no, certificate_series)
+                detection_list = safe_get(vehicul_treceri.get("detectionList"), [])
+            except PortalIndisponibil:
+                # întrerupătorul a fost deja raportat o dată; nu repetăm eroarea per vehicul
+                return None
             except Exception as e:
-                _LOGGER.error("Eroare la obținerea tranzacțiilor: %s", e)
-                tranzactii_lista = []
+                _LOGGER.error(
+                    "Eroare la obținerea trecerilor pentru %s (după %.2f s): %s",
+                    plate_no, time.monotonic() - start, e,
+                )
+                return None
+
+        durata = time.monotonic() - start
+        self.api.metrici.inregistreaza_durata("treceri_pod", durata)
+        _LOGGER.debug("Treceri pod pentru %s: %d detecții în %.2f s", plate_no, len(detection_list), durata)
+        return detection_list
+
+    # -------------------------------------------------------------------------
+    #                 Etape cu cadență proprie
+    # -------------------------------------------------------------------------
+    def _etapa_scadenta(self, etapa: str) -> bool:
+        """Verifică dacă a trecut cadența etapei de la ultima rulare reușită."""
+        ultima = self._ultima_rulare.get(etapa)
+        if ultima is None:
+            return True
+        # Toleranța evită ca un ciclu sosit cu câteva secunde mai devreme să amâne etapa
+        return time.monotonic() - ultima >= self.cadente[etapa] - CADENTA_TOLERANTA
+
+    async def _async_ruleaza_etapa(self, etapa: str, fetch, implicit):
+        """Rulează etapa dacă este scadentă; altfel (sau la eroare) păstrează valoarea publicată."""
+        anterior = (self.data or {}).get(ETAPE[etapa][0], implicit)
+        if not self._etapa_scadenta(etapa):
+            return anterior
+        try:
+            with self.api.metrici.cronometreaza(etapa):
+                rezultat = await fetch()
+        except PortalIndisponibil as e:
+            _LOGGER.debug("Etapa %s amânată: %s", etapa, e)
+            self._etape_esuate.add(etapa)
+            return anterior
+        except Exception as e:
+            _LOGGER.error("Eroare la obținerea %s: %s", ETAPE[etapa][1], e)
+            self._etape_esuate.add(etapa)
+            return anterior
+        self._ultima_rulare[etapa] = time.monotonic()
+        return rezultat
+
+    async def _async_fetch_user_data(self) -> dict:
+        """Etapa utilizator: date utilizator (folosind endpoint-ul corect)."""
+        user_data = await self.api.get_user_data()
+        _LOGGER.debug("Răspuns get_user_data: %s", rezumat(user_data, fragment=False))
+        return user_data
+
+    async def _async_fetch_vehicule(self, semafor: asyncio.Semaphore, sarcini_treceri: list) -> dict:
+        """Etapa vehicule: toate paginile din getDataPaginated.
+
+        Paginile sunt consumate pe măsură ce sosesc, iar trecerile de pod ale vehiculelor
+        de pe fiecare pagină pornesc imediat (sarcinile sunt adăugate în `sarcini_treceri`).
+        """
+        paginated_data = {}
+        view = []
+        async for pagina in self.api.iter_paginated_data():
+            _LOGGER.debug("Pagină get_paginated_data: %s", rezumat(pagina, fragment=False))
+            if not paginated_data:
+                # păstrăm câmpurile de pe prima pagină (total etc.)
+                paginated_data = dict(pagina)
+            items = safe_get(pagina.get("view"), [])
+            view.extend(items)
+            for item in items:
+                entity = safe_get(item.get("entity"), {})
+                sarcini_treceri.append((
+                    entity.get("plateNo"),
+                    asyncio.create_task(self._async_fetch_treceri_vehicul(entity, semafor)),
+                ))
+        paginated_data["view"] = view
+        self.vehicule_data = [safe_get(vehicul.get("entity"), {}) for vehicul in view]
+        _LOGGER.debug("Au fost încărcate %d vehicule.", len(view))
+        return paginated_data
+
+    async def _async_fetch_vehicule_si_treceri(self) -> tuple[dict, dict[str, list[dict]]]:
+        """Etapele vehicule și treceri de pod.
+
+        Trecerile de pod rulează la fiecare ciclu și depind doar de lista de vehicule:
+        pornesc de îndată ce aceasta sosește sau, dacă lista nu este scadentă ori nu a putut
+        fi obținută, pentru ultima listă cunoscută.
+        """
+        semafor = asyncio.Semaphore(max(1, self.cereri_simultane))
+        sarcini_treceri = []
+        paginated_data = await self._async_ruleaza_etapa(
+            "vehicule", lambda: self._async_fetch_vehicule(semafor, sarcini_treceri), {}
+        )
+        if not sarcini_treceri:
+            sarcini_treceri = [
+                (
+                    vehicul.get("plateNo"),
+                    asyncio.create_task(self._async_fetch_treceri_vehicul(vehicul, semafor)),
+                )
+                for vehicul in self.vehicule_data
+            ]
+
+        # Treceri de pod (în paralel, limitat de cereri_simultane), păstrate pe vehicul.
+        # Vehiculele pentru care cererea eșuează își păstrează ultimele treceri cunoscute.
+        rezultate_treceri = await asyncio.gather(*(sarcina for _, sarcina in sarcini_treceri))
+        if rezultate_treceri and all(rezultat is None for rezultat in rezultate_treceri):
+            # niciun vehicul nu a primit treceri noi (de regulă, portal indisponibil)
+            self._etape_esuate.add("treceri_pod")
+        anterioare = safe_get((self.data or {}).get("treceri_pod"), {})
+        treceri_pod = {
+            vehicul.get("plateNo"): anterioare[vehicul.get("plateNo")]
+            for vehicul in self.vehicule_data
+            if vehicul.get("plateNo") in anterioare
+        }
+        for (plate_no, _), detection_list in zip(sarcini_treceri, rezultate_treceri):
+            if plate_no and detection_list is not None:
+                treceri_pod[plate_no] = detection_list
+
+        return paginated_data, treceri_pod
+
+    async def _async_fetch_countries(self) -> list:
+        """Etapa țări: lista de țări."""
+        countries_data = await self.api.get_countries()
+        _LOGGER.debug("Răspuns get_countries: %s", rezumat(countries_data))
+        return countries_data
+
+    def forteaza_reconcilierea_tranzactiilor(self) -> None:
+        """Cere ca următorul ciclu să descarce din nou întregul istoric de tranzacții."""
+        self._ultima_reconciliere = None
+
+    async def _async_fetch_tranzactii(self) -> list:
+        """Etapa tranzacții, sincronizată incremental.
+
+        În mod normal se cere doar intervalul de la ultima tranzacție văzută (minus o
+        suprapunere) până acum, iar rezultatul este îmbinat, fără duplicate, în magazinul
+        local. Istoricul complet este descărcat doar la reconciliere (o dată la
+        TRANZACTII_RECONCILIERE_INTERVAL), când magazinul este reconstruit de la zero.
+        """
+        now = datetime.now()
+        date_to = int(now.timestamp() * 1000)
+        inceput_istoric = int((now - timedelta(days=self.istoricul_tranzactiilor * 365)).timestamp() * 1000)
+        reconciliere = (
+            self._ultima_reconciliere is None
+            or self._tranzactii_marcaj is None
+            or (now - self._ultima_reconciliere).total_seconds() >= TRANZACTII_RECONCILIERE_INTERVAL
+        )
+        if reconciliere:
+            date_from = inceput_istoric
+        else:
+            date_from = max(inceput_istoric, self._tranzactii_marcaj - TRANZACTII_SUPRAPUNERE * 1000)
+
+        transactions = await self.api.get_tranzactii(date_from, date_to)
+        tranzactii_noi = safe_get(transactions.get("view"), [])
+
+        if reconciliere:
+            self._tranzactii = {}
+            self._ultima_reconciliere = now
+
+        adaugate = 0
+        for tranzactie in tranzactii_noi:
+            if not isinstance(tranzactie, dict):
+                continue
+            cheie = tranzactie_cheie(tranzactie)
+            if cheie not in self._tranzactii:
+                adaugate += 1
+            self._tranzactii[cheie] = tranzactie
+
+        # Eliminăm tranzacțiile ieșite din fereastra de istoric
+        self._tranzactii = {
+            cheie: tranzactie
+            for cheie, tranzactie in self._tranzactii.items()
+            if (tranzactie_timestamp(tranzactie) or date_to) >= inceput_istoric
+        }
+
+        timestamps = [ts for ts in map(tranzactie_timestamp, self._tranzactii.values()) if ts is not None]
+        # Fără date în tranzacții, marcajul devine momentul ultimei interogări reușite
+        self._tranzactii_marcaj = max(timestamps) if timestamps else date_to
+
+        _LOGGER.debug(
+            "Tranzacții (%s): %d primite, %d noi, %d în total.",
+            "reconciliere" if reconciliere else "delta",
+            len(tranzactii_noi), adaugate, len(self._tranzactii),
+        )
+        return list(self._tranzactii.values())
+
+    async def async_refresh_vehicul(self, vin: str, plate_no: str, certificate_series: str) -> bool:
+        """Reîmprospătează la cerere trecerile de pod ale unui singur vehicul.
+
+        Cererile simultane pentru același vehicul sunt comasate: apelanții care sosesc
+        cât timp o reîmprospătare este în curs așteaptă rezultatul ei, fără o nouă cerere.
+        Returnează True dacă datele au fost actualizate.
+        """
+        sarcina = self._vehicule_in_curs.get(plate_no)
+        if sarcina is None:
+            sarcina = self.hass.async_create_task(
+                self._async_refresh_vehicul(vin, plate_no, certificate_series)
+            )
+            self._vehicule_in_curs[plate_no] = sarcina
+            sarcina.add_done_callback(lambda _: self._vehicule_in_curs.pop(plate_no, None))
+        else:
+            _LOGGER.debug("Reîmprospătarea pentru %s este deja în curs; o reutilizăm.", plate_no)
+        return await asyncio.shield(sarcina)
+
+    async def _async_refresh_vehicul(self, vin: str, plate_no: str, certificate_series: str) -> bool:
+        """Actualizează doar partiția vehiculului (și indexurile sale), fără să atingă
+        datele celorlalte vehicule."""
+        detection_list = await self._async_fetch_treceri_vehicul(
+            {"vin": vin, "plateNo": plate_no, "certificateSeries": certificate_series},
+            asyncio.Semaphore(1),
+        )
+        if detection_list is None or self.data is None:
+            return False
+
+        self.data.setdefault("treceri_pod", {})[plate_no] = detection_list
+        self.detectii_by_plate[plate_no] = detection_list
+        if vin:
+            self.detectii_by_vehicul[(vin, plate_no)] = _detectii_cu_vin(detection_list, vin)
+        self.amprente[plate_no] = self._amprenta_vehicul(plate_no)
+        self.generatie += 1
+        if self._store is not None:
+            self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+        self.async_update_listeners()
+        return True
+
+    async def _async_update_data(self) -> dict:
+        """Actualizează datele periodic prin apelurile către API.
+
+        Etapele independente (utilizator, vehicule + treceri, țări, tranzacții) rulează
+        în paralel, astfel încât durata unui ciclu este dată de cel mai lent lanț, nu de
+        suma tuturor apelurilor. Fiecare etapă are propria cadență: cele care nu sunt
+        scadente își păstrează valoarea publicată anterior; trecerile de pod rulează la
+        fiecare ciclu.
+        """
+        _LOGGER.debug("Începem actualizarea datelor în ErovinietaCoordinator...")
+
+        try:
+            start = time.monotonic()
+            self._etape_esuate = set()
+            (
+                user_data,
+                (paginated_data, treceri_pod),
+                countries_data,
+                tranzactii_lista,
+            ) = await asyncio.gather(
+                self._async_ruleaza_etapa("utilizator", self._async_fetch_user_data, {}),
+                self._async_fetch_vehicule_si_treceri(),
+                self._async_ruleaza_etapa("tari", self._async_fetch_countries, []),
+                self._async_ruleaza_etapa("tranzactii", self._async_fetch_tranzactii, []),
+            )
 
-            # 6. Consolidare date
+            # Consolidare date
             new_data = {
                 "user_data": user_data,  # Salvează datele brute din get_user_data
                 "paginated_data": paginated_data,
                 "countries_data": countries_data,
                 "transactions": tranzactii_lista,
-                "detectionList": safe_get(treceri_pod_data.get("detectionList"), []),
+                "treceri_pod": treceri_pod,  # număr de înmatriculare -> listă de treceri
             }
 
             self.data = new_data
-            _LOGGER.info("Datele au fost actualizate cu succes.")
+            self._rebuild_indexes()
+            self.generatie += 1
+            self.ajusteaza_intervalul()
+            if self._store is not None:
+                self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+            durata = time.monotonic() - start
+            if self._etape_esuate:
+                # datele anterioare au fost păstrate; actualizarea nu contează ca reușită
+                self.api.metrici.actualizari_incomplete += 1
+                _LOGGER.info(
+                    "Actualizare incompletă în %.2f s; etape fără date noi: %s.",
+                    durata, ", ".join(sorted(self._etape_esuate)),
+                )
+            else:
+                self.api.metrici.inregistreaza_durata("actualizare", durata)
+                self.api.metrici.marcheaza_succesul()
+                _LOGGER.info("Datele au fost actualizate cu succes în %.2f s.", durata)
+            _LOGGER.debug("Statistici cache API: %s", self.api.cache_stats)
             return self.data
 
         except Exception as e:
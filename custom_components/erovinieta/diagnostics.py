@@ -0,0 +1,57 @@
+"""Diagnostic pentru integrarea Erovinieta: metrici, starea portalului și a sesiunii."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+# Câmpuri cu date personale, înlocuite cu "**REDACTED**"
+TO_REDACT = {
+    "username",
+    "password",
+    "email",
+    "vin",
+    "plateNo",
+    "plate_no",
+    "certificateSeries",
+    "certificate_series",
+}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Returnează diagnosticul unei intrări: metricile actualizărilor, fără date personale."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    api = coordinator.api
+    intrerupator = api.intrerupator
+    data = coordinator.data or {}
+
+    return {
+        "entry": async_redact_data({"data": dict(entry.data), "options": dict(entry.options)}, TO_REDACT),
+        "metrici": api.metrici.ca_dict(),
+        "portal": {
+            "stare": intrerupator.stare,
+            "erori_consecutive": intrerupator.erori_consecutive,
+            "ultima_eroare": intrerupator.ultima_eroare,
+            "deschideri": intrerupator.deschideri,
+            "proba_peste_secunde": intrerupator.secunde_pana_la_proba(),
+        },
+        "sesiune": {
+            "autentificat": api.is_authenticated(),
+            "durata_sesiune": api.durata_sesiune,
+            "generatie_sesiune": api.generatie_sesiune,
+        },
+        "cache": dict(api.cache_stats),
+        "coordinator": {
+            "interval_actualizare": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+            "cadente": dict(coordinator.cadente),
+            "ultima_actualizare_reusita": coordinator.last_update_success,
+            "vehicule": len(coordinator.view_by_plate),
+            "treceri_pod": sum(len(treceri) for treceri in (data.get("treceri_pod") or {}).values()),
+            "tranzactii": len(data.get("transactions") or []),
+        },
+    }
@@ -0,0 +1,61 @@
+"""Rezumate ieftine pentru jurnalizarea răspunsurilor mari, calculate doar la nevoie.
+
+`rezumat(valoare)` întoarce un obiect care se transformă în text abia când mesajul de
+jurnal este efectiv formatat, adică doar dacă nivelul lui este activ:
+
+    _LOGGER.debug("Răspuns getDataPaginated: %s", rezumat(pagina))
+
+Textul conține dimensiunea, o amprentă scurtă și un fragment trunchiat, în locul
+conținutului complet, astfel încât jurnalul de depanare rămâne mic și nu expune
+listele întregi de vehicule, tranzacții sau treceri de pod.
+"""
+
+import hashlib
+import json
+
+# Lungimea maximă a fragmentului afișat din conținut
+LUNGIME_FRAGMENT = 120
+
+
+class Rezumat:
+    """Rezumat leneș al unei valori: formatat doar când mesajul de jurnal este emis."""
+
+    __slots__ = ("valoare", "fragment")
+
+    def __init__(self, valoare, fragment: bool = True):
+        """Reține valoarea; `fragment=False` omite conținutul (de ex. pentru date personale)."""
+        self.valoare = valoare
+        self.fragment = fragment
+
+    def __str__(self) -> str:
+        valoare = self.valoare
+        if valoare is None:
+            return "None"
+        if isinstance(valoare, bytes):
+            text = valoare.decode("utf-8", "replace")
+        elif isinstance(valoare, str):
+            text = valoare
+        else:
+            text = json.dumps(valoare, ensure_ascii=False, sort_keys=True, default=str)
+
+        parti = [f"{len(text)} caractere", f"sha1={hashlib.sha1(text.encode()).hexdigest()[:10]}"]
+        if isinstance(valoare, dict):
+            parti.append(f"chei={sorted(valoare)[:10]}")
+            for cheie, continut in valoare.items():
+                if isinstance(continut, list):
+                    parti.append(f"{cheie}[{len(continut)}]")
+        elif isinstance(valoare, list):
+            parti.append(f"elemente={len(valoare)}")
+        if self.fragment:
+            text = " ".join(text.split())
+            if len(text) > LUNGIME_FRAGMENT:
+                text = text[:LUNGIME_FRAGMENT] + "…"
+            parti.append(repr(text))
+        return ", ".join(parti)
+
+    __repr__ = __str__
+
+
+def rezumat(valoare, fragment: bool = True) -> Rezumat:
+    """Rezumatul leneș al unui corp de răspuns sau payload (vezi `Rezumat`)."""
+    return Rezumat(valoare, fragment)
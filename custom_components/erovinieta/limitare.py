@@ -0,0 +1,81 @@
+"""Limitarea și eșalonarea cererilor către portal, comune tuturor conturilor configurate."""
+
+import asyncio
+import logging
+import math
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LimitatorRata:
+    """Token bucket: cel mult `rata` cereri pe secundă, cu rafale de până la `capacitate`.
+
+    O singură instanță este partajată de toate intrările domeniului, astfel încât mai
+    multe conturi nu pot trimite împreună mai multe cereri decât ar trimite unul singur.
+    Cererile care așteaptă sunt servite în ordinea sosirii.
+    """
+
+    def __init__(self, rata: float, capacitate: int):
+        """Inițializează limitatorul (plin)."""
+        self.rata = rata
+        self.capacitate = capacitate
+        self.asteptari = 0  # câte cereri au trebuit să aștepte un jeton
+        self._jetoane = float(capacitate)
+        self._ultima_reumplere = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _reumple(self) -> None:
+        """Adaugă jetoanele acumulate de la ultima reumplere."""
+        acum = time.monotonic()
+        self._jetoane = min(self.capacitate, self._jetoane + (acum - self._ultima_reumplere) * self.rata)
+        self._ultima_reumplere = acum
+
+    async def asteapta(self) -> None:
+        """Așteaptă (dacă este nevoie) și consumă un jeton."""
+        async with self._lock:
+            self._reumple()
+            if self._jetoane < 1:
+                self.asteptari += 1
+                await asyncio.sleep((1 - self._jetoane) / self.rata)
+                self._reumple()
+            self._jetoane -= 1
+
+
+class PlanificatorActualizari:
+    """Repartizează uniform, în timp, actualizările periodice ale conturilor.
+
+    Fiecare cont primește o fază egală cu poziția sa împărțită la numărul de conturi.
+    Intervalul până la următoarea actualizare este ajustat astfel încât aceasta să cadă
+    pe faza contului, în loc ca toate conturile să pornească împreună.
+    """
+
+    def __init__(self):
+        """Inițializează planificatorul, fără conturi."""
+        self._intrari: list[str] = []
+        self._epoca = time.monotonic()
+
+    def inregistreaza(self, entry_id: str) -> None:
+        """Adaugă un cont în planificare."""
+        if entry_id not in self._intrari:
+            self._intrari.append(entry_id)
+
+    def elimina(self, entry_id: str) -> None:
+        """Scoate un cont din planificare."""
+        if entry_id in self._intrari:
+            self._intrari.remove(entry_id)
+
+    def interval_aliniat(self, entry_id: str, interval: float) -> float:
+        """Intervalul (secunde) până la următorul moment care cade pe faza contului.
+
+        Rezultatul este între jumătate și o dată și jumătate din `interval`, deci
+        alinierea nu grăbește și nu amână o actualizare cu mai mult de o jumătate de ciclu.
+        """
+        if entry_id not in self._intrari or len(self._intrari) < 2 or interval <= 0:
+            return interval
+        faza = self._intrari.index(entry_id) / len(self._intrari) * interval
+        acum = time.monotonic() - self._epoca
+        tinta = math.floor(acum / interval) * interval + faza
+        while tinta < acum + interval / 2:
+            tinta += interval
+        return tinta - acum
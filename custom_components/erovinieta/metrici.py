@@ -0,0 +1,99 @@
+"""Metrici ale ciclurilor de actualizare: durate pe etape, cereri, octeți, reîncercări."""
+
+import math
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# Limitele superioare (secunde) ale intervalelor histogramelor de durată
+INTERVALE_DURATA = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, math.inf)
+
+
+class Histograma:
+    """Histogramă cumulativă cu intervale fixe, plus număr, sumă, minim, maxim și ultima valoare."""
+
+    def __init__(self, intervale=INTERVALE_DURATA):
+        """Inițializează o histogramă goală."""
+        self.intervale = intervale
+        self.frecvente = [0] * len(intervale)
+        self.numar = 0
+        self.suma = 0.0
+        self.minim = None
+        self.maxim = None
+        self.ultima = None
+
+    def inregistreaza(self, valoare: float) -> None:
+        """Adaugă o observație."""
+        for index, limita in enumerate(self.intervale):
+            if valoare <= limita:
+                self.frecvente[index] += 1
+                break
+        self.numar += 1
+        self.suma += valoare
+        self.minim = valoare if self.minim is None else min(self.minim, valoare)
+        self.maxim = valoare if self.maxim is None else max(self.maxim, valoare)
+        self.ultima = valoare
+
+    def ca_dict(self) -> dict:
+        """Rezumatul histogramei, serializabil (atribute, diagnostic)."""
+        return {
+            "numar": self.numar,
+            "medie": round(self.suma / self.numar, 3) if self.numar else None,
+            "minim": round(self.minim, 3) if self.minim is not None else None,
+            "maxim": round(self.maxim, 3) if self.maxim is not None else None,
+            "ultima": round(self.ultima, 3) if self.ultima is not None else None,
+            "intervale": {
+                (f"<={limita:g}s" if limita != math.inf else "peste"): frecventa
+                for limita, frecventa in zip(self.intervale, self.frecvente)
+            },
+        }
+
+
+class Metrici:
+    """Metricile unui cont, înregistrate de ErovinietaAsyncAPI și de coordinator."""
+
+    def __init__(self):
+        """Inițializează contoarele la zero."""
+        self.durate: dict[str, Histograma] = {}
+        self.cereri = Counter()  # endpoint -> număr de cereri trimise
+        self.octeti_primiti = 0
+        self.reincercari = 0
+        self.autentificari = 0
+        self.reautentificari = 0  # autentificări cauzate de o sesiune respinsă de server
+        self.actualizari_incomplete = 0  # cicluri în care o etapă scadentă a eșuat
+        self.ultimul_succes: datetime | None = None
+
+    def inregistreaza_durata(self, etapa: str, secunde: float) -> None:
+        """Adaugă o durată în histograma etapei."""
+        histograma = self.durate.get(etapa)
+        if histograma is None:
+            histograma = self.durate[etapa] = Histograma()
+        histograma.inregistreaza(secunde)
+
+    @contextmanager
+    def cronometreaza(self, etapa: str):
+        """Măsoară durata blocului și o înregistrează pentru etapă (și la excepții)."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.inregistreaza_durata(etapa, time.monotonic() - start)
+
+    def marcheaza_succesul(self) -> None:
+        """Notează momentul ultimei actualizări reușite (toate etapele scadente au adus date)."""
+        self.ultimul_succes = datetime.now(timezone.utc)
+
+    def ca_dict(self) -> dict:
+        """Toate metricile, serializabile (atribute, diagnostic)."""
+        return {
+            "durate": {etapa: histograma.ca_dict() for etapa, histograma in sorted(self.durate.items())},
+            "cereri": dict(self.cereri),
+            "cereri_total": sum(self.cereri.values()),
+            "octeti_primiti": self.octeti_primiti,
+            "reincercari": self.reincercari,
+            "autentificari": self.autentificari,
+            "reautentificari": self.reautentificari,
+            "actualizari_incomplete": self.actualizari_incomplete,
+            "ultimul_succes": self.ultimul_succes.isoformat() if self.ultimul_succes else None,
+        }
@@ -0,0 +1,233 @@
+"""Parsare incrementală a răspunsurilor JSON cu liste mari (tranzacții, treceri de pod).
+
+Răspunsurile de forma `{"view": [ {...}, {...}, ... ], "total": ...}` sunt parsate pe
+măsură ce sosesc fragmentele din rețea: elementele listei urmărite sunt decodate unul
+câte unul, reduse la câmpurile folosite de senzori și adăugate în rezultat, iar textul
+deja consumat este eliberat. Astfel nu mai sunt ținute în memorie simultan textul
+complet al răspunsului și obiectele decodate cu toate câmpurile lor.
+
+Dacă răspunsul nu este un obiect JSON (de ex. pagina HTML de login după expirarea
+sesiunii), parserul acumulează textul și îl decodează la final, ca înainte.
+
+Elementele sunt decodate incremental, dar predate apelantului abia după ce răspunsul a
+sosit complet și valid: o cerere întreruptă la jumătate este reîncercată sau urmată de
+reautentificare, iar apelantul nu trebuie să vadă o listă parțială.
+"""
+
+import codecs
+import json
+import re
+
+# Stările parserului
+_INCEPUT = "inceput"      # înaintea acoladei de deschidere
+_CHEIE = "cheie"          # în obiectul de nivel superior, înaintea unei chei sau a lui '}'
+_VALOARE = "valoare"      # după "cheie":, înaintea valorii
+_ELEMENTE = "elemente"    # în lista urmărită, înaintea unui element sau a lui ']'
+_SFARSIT = "sfarsit"      # după acolada de închidere
+_TEXT = "text"            # răspunsul nu este un obiect JSON: acumulăm textul
+
+# Ce poate urma, în obiectul de nivel superior sau în lista urmărită
+_PRIMUL = "primul"              # imediat după '{' / '[': o valoare sau închiderea
+_DUPA_VIRGULA = "dupa_virgula"  # după ',': obligatoriu o valoare
+_DUPA_VALOARE = "dupa_valoare"  # după o valoare: ',' sau închiderea
+
+_SPATII = " \t\n\r"
+_SCALAR = re.compile(r"[^,}\] \t\n\r]*").match
+_SARI_SPATII = re.compile(r"[ \t\n\r]*").match
+_DECODOR = json.JSONDecoder()
+
+# Câte caractere de la începutul răspunsului sunt păstrate pentru mesajele de eroare
+LUNGIME_INCEPUT = 1024
+
+
+def _decodeaza(text: str, pozitie: int):
+    """Decodează valoarea JSON de la `pozitie`; întoarce (valoare, sfârșit) sau None dacă e incompletă.
+
+    Valoarea e considerată incompletă (restul sosește în fragmentul următor) când
+    decodarea se oprește la capătul textului sau într-un șir neterminat; altfel eroarea
+    este ridicată. Numerele, true, false și null sunt complete doar când sunt urmate de
+    un separator (`-1` poate continua cu `.5` în fragmentul următor).
+    """
+    if text[pozitie] not in '{["':
+        sfarsit = _SCALAR(text, pozitie).end()
+        if sfarsit >= len(text):
+            return None
+        valoare, capat = _DECODOR.raw_decode(text, pozitie)
+        if capat != sfarsit:
+            raise ValueError(f"Valoare JSON invalidă: {text[pozitie:sfarsit]!r}.")
+        return valoare, sfarsit
+    try:
+        return _DECODOR.raw_decode(text, pozitie)
+    except json.JSONDecodeError as e:
+        # o secvență \uXXXX tăiată se poate opri cu câteva caractere înainte de capăt
+        if e.pos >= len(text) - 6 or e.msg.startswith("Unterminated string"):
+            return None
+        raise
+
+
+class ParserLista:
+    """Parser incremental pentru un obiect JSON cu o listă urmărită (`cheie`).
+
+    Se alimentează cu fragmente de octeți (`alimenteaza`), apoi `incheie()` întoarce
+    obiectul decodat. Elementele listei urmărite păstrează doar câmpurile din `campuri`;
+    celelalte chei de nivel superior sunt păstrate întregi.
+
+    Cu `chei_identitate`, un element fără niciuna dintre aceste chei este păstrat întreg:
+    deduplicarea lui se face după conținutul complet, iar câmpurile reduse nu ar mai
+    deosebi elemente diferite (de ex. două facturi cu aceeași valoare).
+    """
+
+    def __init__(self, cheie: str, campuri, chei_identitate=(), encoding: str = "utf-8"):
+        """Inițializează parserul pentru lista `cheie`, cu câmpurile păstrate `campuri`."""
+        self.cheie = cheie
+        self.campuri = tuple(campuri)
+        self.chei_identitate = tuple(chei_identitate)
+        try:
+            self._decodor = codecs.getincrementaldecoder(encoding)(errors="replace")
+        except LookupError:
+            self._decodor = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._text = ""
+        self._stare = _INCEPUT
+        self._cheie_curenta = None
+        self._urmeaza = _PRIMUL
+        self.rezultat = {}
+        self.elemente = 0
+        self.inceput = ""  # începutul răspunsului, pentru mesajele de eroare
+        self._eroare = None
+
+    def alimenteaza(self, fragment: bytes) -> None:
+        """Adaugă un fragment din corpul răspunsului și decodează tot ce este complet.
+
+        O eroare de sintaxă nu este ridicată aici: restul fragmentelor sunt ignorate, iar
+        eroarea este ridicată de `incheie()`.
+        """
+        if self._eroare is not None:
+            return
+        text = self._decodor.decode(fragment)
+        if len(self.inceput) < LUNGIME_INCEPUT:
+            self.inceput += text[:LUNGIME_INCEPUT - len(self.inceput)]
+        self._text += text
+        if self._stare != _TEXT:
+            try:
+                self._parseaza()
+            except ValueError as e:
+                self._eroare = e
+                self._text = ""
+
+    def incheie(self):
+        """Întoarce obiectul decodat; ridică ValueError dacă răspunsul nu este JSON valid."""
+        if self._eroare is not None:
+            raise self._eroare
+        self._text += self._decodor.decode(b"", final=True)
+        if self._stare == _TEXT:
+            return json.loads(self._text)
+        self._parseaza()
+        if self._stare != _SFARSIT or self._text.strip(_SPATII):
+            raise ValueError(f"JSON incomplet sau invalid (stare {self._stare}).")
+        return self.rezultat
+
+    def _filtreaza(self, element):
+        """Reduce un element al listei la câmpurile folosite."""
+        if not isinstance(element, dict):
+            return element
+        if self.chei_identitate and all(
+            element.get(camp) in (None, "") for camp in self.chei_identitate
+        ):
+            return element
+        # cheile sunt luate din `campuri`, nu din element: fiecare raw_decode creează
+        # șiruri noi pentru chei, iar așa sunt partajate de toate elementele
+        return {camp: element[camp] for camp in self.campuri if camp in element}
+
+    def _separator(self, caracter: str, inchidere: str) -> bool:
+        """Tratează ',' sau caracterul de închidere; întoarce True dacă `caracter` a fost unul dintre ele.
+
+        Ridică ValueError pentru o virgulă sau o închidere nepermisă și pentru două valori
+        fără virgulă între ele.
+        """
+        if caracter == ",":
+            if self._urmeaza != _DUPA_VALOARE:
+                raise ValueError("Virgulă neașteptată în JSON.")
+            self._urmeaza = _DUPA_VIRGULA
+            return True
+        if caracter == inchidere:
+            if self._urmeaza == _DUPA_VIRGULA:
+                raise ValueError(f"Valoare JSON așteptată înainte de {inchidere!r}.")
+            return True
+        if self._urmeaza == _DUPA_VALOARE:
+            raise ValueError(f"',' sau {inchidere!r} așteptat în JSON, găsit {caracter!r}.")
+        return False
+
+    def _parseaza(self) -> None:
+        """Consumă din text toate valorile complete, apoi eliberează textul consumat."""
+        text = self._text
+        pozitie = 0
+        lungime = len(text)
+        while True:
+            pozitie = _SARI_SPATII(text, pozitie).end()
+            if pozitie >= lungime:
+                break
+            caracter = text[pozitie]
+
+            if self._stare == _INCEPUT:
+                if caracter != "{":
+                    # nu este un obiect JSON: decodăm totul la final, ca înainte
+                    self._stare = _TEXT
+                    return
+                self._stare = _CHEIE
+                self._urmeaza = _PRIMUL
+                pozitie += 1
+
+            elif self._stare == _CHEIE:
+                if self._separator(caracter, "}"):
+                    if caracter == "}":
+                        self._stare = _SFARSIT
+                    pozitie += 1
+                    continue
+                if caracter != '"':
+                    raise ValueError(f"Cheie JSON așteptată, găsit {caracter!r}.")
+                decodat = _decodeaza(text, pozitie)
+                if decodat is None:
+                    break
+                separator = _SARI_SPATII(text, decodat[1]).end()
+                if separator >= lungime:
+                    break
+                if text[separator] != ":":
+                    raise ValueError("Separator ':' lipsă după cheia JSON.")
+                self._cheie_curenta = decodat[0]
+                self._stare = _VALOARE
+                pozitie = separator + 1
+
+            elif self._stare == _VALOARE:
+                if self._cheie_curenta == self.cheie and caracter == "[":
+                    self.rezultat[self.cheie] = []
+                    self._stare = _ELEMENTE
+                    self._urmeaza = _PRIMUL
+                    pozitie += 1
+                    continue
+                decodat = _decodeaza(text, pozitie)
+                if decodat is None:
+                    break
+                self.rezultat[self._cheie_curenta], pozitie = decodat
+                self._stare = _CHEIE
+                self._urmeaza = _DUPA_VALOARE
+
+            elif self._stare == _ELEMENTE:
+                if self._separator(caracter, "]"):
+                    if caracter == "]":
+                        # lista se încheie ca valoare a cheii din obiectul de nivel superior
+                        self._stare = _CHEIE
+                        self._urmeaza = _DUPA_VALOARE
+                    pozitie += 1
+                    continue
+                decodat = _decodeaza(text, pozitie)
+                if decodat is None:
+                    break
+                element, pozitie = decodat
+                self.rezultat[self.cheie].append(self._filtreaza(element))
+                self.elemente += 1
+                self._urmeaza = _DUPA_VALOARE
+
+            else:  # _SFARSIT: doar spații sunt permise; restul e semnalat în incheie()
+                break
+
+        self._text = text[pozitie:]
@@ -0,0 +1,120 @@
+"""Reîncercări cu backoff și întrerupător de circuit pentru cererile către portal."""
+
+import logging
+import random
+import time
+from dataclasses import dataclass
+
+_LOGGER = logging.getLogger(__name__)
+
+# Stările întrerupătorului de circuit
+STARE_INCHIS = "inchis"  # portalul răspunde; cererile trec normal
+STARE_DESCHIS = "deschis"  # portalul este căzut; cererile sunt refuzate local
+STARE_SEMIDESCHIS = "semideschis"  # o singură cerere de probă verifică revenirea portalului
+
+
+class PortalIndisponibil(Exception):
+    """Cererea a fost refuzată local, deoarece întrerupătorul de circuit este deschis."""
+
+
+@dataclass(frozen=True)
+class PoliticaReincercare:
+    """Politica de reîncercare pentru un endpoint.
+
+    Întârzierea dinaintea reîncercării `n` (de la 1) este aleasă uniform între 0 și
+    min(intarziere_maxima, intarziere_initiala * factor ** (n - 1)) ("full jitter"), astfel
+    încât clienții care au eșuat simultan nu revin tot simultan.
+    """
+
+    incercari: int = 3  # numărul total de încercări, inclusiv prima
+    intarziere_initiala: float = 1.0
+    intarziere_maxima: float = 15.0
+    factor: float = 2.0
+    timeout: float = 10.0  # timeout per încercare, în secunde
+
+    def intarziere(self, reincercare: int) -> float:
+        """Secundele de așteptat înaintea reîncercării cu numărul dat (de la 1)."""
+        plafon = min(self.intarziere_maxima, self.intarziere_initiala * self.factor ** (reincercare - 1))
+        return random.uniform(0, plafon)
+
+
+def status_reincercabil(status_code) -> bool:
+    """Eroare de rețea (fără status), 429 sau 5xx: merită reîncercată."""
+    return status_code is None or status_code == 429 or status_code >= 500
+
+
+class IntrerupatorCircuit:
+    """Întrerupător de circuit pentru portal.
+
+    După `prag_erori` eșecuri consecutive, întrerupătorul se deschide pentru `timp_deschis`
+    secunde, timp în care cererile sunt refuzate fără a mai ajunge la portal. Apoi trece o
+    singură cerere de probă: succesul închide circuitul, eșecul îl redeschide. O probă
+    rămasă fără rezultat mai mult de `timp_deschis` secunde este considerată pierdută și
+    următoarea cerere o poate relua.
+    """
+
+    def __init__(self, prag_erori: int = 5, timp_deschis: float = 300):
+        """Inițializează întrerupătorul (închis)."""
+        self.prag_erori = prag_erori
+        self.timp_deschis = timp_deschis
+        self.stare = STARE_INCHIS
+        self.erori_consecutive = 0
+        self.ultima_eroare = None
+        self.deschideri = 0
+        self._redeschide_la = None  # time.monotonic() la care se permite proba
+        self._proba_de_la = None  # time.monotonic() la care a fost rezervată proba în curs
+
+    def permite(self) -> bool:
+        """Verifică dacă o cerere poate ajunge la portal (și rezervă proba, în semideschis)."""
+        if self.stare == STARE_INCHIS:
+            return True
+        if self.stare == STARE_DESCHIS and time.monotonic() >= self._redeschide_la:
+            self.stare = STARE_SEMIDESCHIS
+            self._proba_de_la = None
+            _LOGGER.info("Întrerupător semideschis: verificăm dacă portalul și-a revenit.")
+        if self.stare == STARE_SEMIDESCHIS:
+            acum = time.monotonic()
+            if self._proba_de_la is not None and acum - self._proba_de_la < self.timp_deschis:
+                return False
+            if self._proba_de_la is not None:
+                _LOGGER.debug("Proba anterioară a rămas fără rezultat; trimitem o probă nouă.")
+            self._proba_de_la = acum
+            return True
+        return False
+
+    def inregistreaza_succes(self) -> None:
+        """Portalul a răspuns: circuitul se închide."""
+        if self.stare != STARE_INCHIS:
+            _LOGGER.info("Portalul răspunde din nou; întrerupătorul se închide.")
+        self.stare = STARE_INCHIS
+        self.erori_consecutive = 0
+        self._proba_de_la = None
+
+    def inregistreaza_esec(self, motiv) -> None:
+        """Portalul nu a răspuns (sau a răspuns cu eroare de server)."""
+        self.erori_consecutive += 1
+        self.ultima_eroare = str(motiv)
+        if self.stare == STARE_SEMIDESCHIS or (
+            self.stare == STARE_INCHIS and self.erori_consecutive >= self.prag_erori
+        ):
+            self.stare = STARE_DESCHIS
+            self.deschideri += 1
+            self._proba_de_la = None
+            self._redeschide_la = time.monotonic() + self.timp_deschis
+            _LOGGER.warning(
+                "Portalul pare indisponibil (%d erori consecutive, ultima: %s). "
+                "Cererile sunt suspendate %d secunde.",
+                self.erori_consecutive,
+                self.ultima_eroare,
+                self.timp_deschis,
+            )
+
+    def anuleaza_proba(self) -> None:
+        """Proba a fost anulată înainte de răspuns; următoarea cerere o poate relua."""
+        self._proba_de_la = None
+
+    def secunde_pana_la_proba(self) -> float | None:
+        """Secundele rămase până la cererea de probă (None dacă circuitul nu e deschis)."""
+        if self.stare != STARE_DESCHIS:
+            return None
+        return max(0.0, self._redeschide_la - time.monotonic())
@@ -3,14 +3,15 @@
 import logging
 from datetime import datetime
 import time
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.core import callback
 from homeassistant.util import dt as dt_util
 from homeassistant.util import slugify
 
-from .const import DOMAIN, ATTRIBUTION, DEFAULT_TRANSACTION_HISTORY_YEARS
+from .const import DOMAIN, ATTRIBUTION, DEFAULT_TRANSACTION_HISTORY_YEARS, TRECERI_POD_ATRIBUTE_MAX
 from .coordinator import ErovinietaCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -28,6 +29,37 @@ def format_timestamp(timestamp_millis):
         return "N/A"
 
 
+def _format_ts_local(timestamp_millis):
+    """Formatează un timestamp (ms) ca 'YYYY-MM-DD HH:MM:SS', sau '' dacă lipsește."""
+    if not timestamp_millis:
+        return ""
+    return datetime.fromtimestamp(timestamp_millis / 1000).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def formateaza_trecere(detection):
+    """Reprezentarea compactă a unei treceri de pod (atribute și răspunsul serviciului)."""
+    return {
+        "Categorie": detection.get("detectionCategory") or "",
+        "Timp detectare": _format_ts_local(detection.get("detectionTimestamp")),
+        "Direcție": detection.get("direction") or "",
+        "Bandă": detection.get("lane") or "",
+        "Valoare (RON)": detection.get("value") or "",
+        "Partener": detection.get("partner") or "",
+        "Metodă plată": detection.get("paymentMethod") or "",
+        "Vehicul": detection.get("paymentPlateNo") or "",
+        "Treceri achiziționate": detection.get("taxName") or "",
+        "Valabilitate până la": _format_ts_local(detection.get("validUntilTimestamp")),
+    }
+
+
+def treceri_recente(detection_list, limita=None):
+    """Trecerile ordonate de la cea mai recentă, opțional limitate la primele `limita`."""
+    ordonate = sorted(
+        detection_list, key=lambda detection: detection.get("detectionTimestamp") or 0, reverse=True
+    )
+    return ordonate if limita is None else ordonate[:limita]
+
+
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Configurează entitățile senzorului pe baza unei intrări de configurare."""
     coordinator: ErovinietaCoordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
@@ -49,7 +81,6 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
     # Adaugă senzori pentru vehicule
     paginated_data = coordinator.data.get("paginated_data", {}).get("view", [])
-    vehicule_data = []  # Pentru stocarea vehiculelor în coordinator
     if paginated_data:
         _LOGGER.debug("Găsite %d vehicule în datele paginate.", len(paginated_data))
         for vehicul in paginated_data:
@@ -106,20 +137,8 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
                 sensors.append(VignetteStartDateSensor(coordinator, config_entry, vehicul))
                 sensors.append(VignetteEndDateSensor(coordinator, config_entry, vehicul))
                 _LOGGER.debug("Senzor SoldSensor creat pentru vehiculul cu număr: %s", plate_no)
-                # ——— Noi senzori detaliu vignietă ———
-
-                # Adaugă vehiculul în vehicule_data
-                vehicule_data.append({
-                    "vin": vin,
-                    "plateNo": plate_no,
-                    "certificateSeries": certificate_series,
-                })
             except Exception as e:
                 _LOGGER.error("Eroare la crearea senzorilor pentru vehiculul %s: %s", plate_no, e)
-
-        # Adaugă vehiculele în coordinator
-        coordinator.vehicule_data = vehicule_data
-        _LOGGER.debug("Vehiculele au fost salvate în coordinator: %s", vehicule_data)
     else:
         _LOGGER.warning("Nu au fost găsite vehicule în datele paginate.")
 
@@ -135,10 +154,17 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     else:
         _LOGGER.warning("Nu au fost găsite tranzacții în datele furnizate.")
 
-    # Adăugăm senzorii în Home Assistant
+    # Senzori de diagnostic: starea conexiunii cu portalul și metricile actualizărilor
+    sensors.append(StarePortalSensor(coordinator, config_entry))
+    sensors.append(DurataActualizareSensor(coordinator, config_entry))
+    sensors.append(CereriPortalSensor(coordinator, config_entry))
+    sensors.append(UltimaActualizareSensor(coordinator, config_entry))
+
+    # Adăugăm senzorii în Home Assistant. Datele vin exclusiv din coordinator, deci nu
+    # este nevoie de update_before_add (care ar trimite încă o rundă de cereri).
     if sensors:
         try:
-            async_add_entities(sensors, update_before_add=True)
+            async_add_entities(sensors)
             _LOGGER.info("Toți senzorii au fost adăugați cu succes.")
         except Exception as e:
             _LOGGER.error("Eroare la adăugarea senzorilor: %s", e)
@@ -152,14 +178,27 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 class ErovinietaBaseSensor(CoordinatorEntity, SensorEntity):
     """Clasa de bază pentru senzorii Erovinieta."""
 
-    def __init__(self, coordinator, config_entry, name, unique_id, entity_id, icon=None):
-        """Inițializează senzorul de bază."""
+    # Senzorii a căror stare depinde de ora curentă (ferestre de 24h, zile rămase) sunt
+    # scriși la fiecare actualizare, chiar dacă datele vehiculului nu s-au schimbat.
+    _dependent_de_timp = False
+
+    def __init__(self, coordinator, config_entry, name, unique_id, entity_id, icon=None, plate_no=None):
+        """Inițializează senzorul de bază.
+
+        `plate_no` leagă senzorul de un vehicul; fără el, senzorul ține de contul întreg.
+        """
         super().__init__(coordinator)
         self.config_entry = config_entry
         self._attr_name = name
         self._attr_unique_id = unique_id
         self._attr_entity_id = entity_id
         self._attr_icon = icon
+        # Rezultate memorate pentru generația curentă a datelor din coordinator
+        self._memo_generatie = None
+        self._memo_valori = {}
+        # Amprenta datelor (și disponibilitatea) la ultima scriere a stării
+        self._plate_amprenta = plate_no
+        self._ultima_amprenta = None
 
         _LOGGER.debug(
             "Inițializare ErovinietaBaseSensor: name=%s, unique_id=%s, entity_id=%s",
@@ -200,15 +239,62 @@ class ErovinietaBaseSensor(CoordinatorEntity, SensorEntity):
         return self._attr_icon
 
 
-    def _get_current_view_item(self, plate_no: str) -> dict | None:
-        """Returnează obiectul din paginated_data.view pentru placa dată."""
-        view = self.coordinator.data.get("paginated_data", {}).get("view", []) or []
-        for item in view:
-            entity = (item or {}).get("entity") or {}
-            if entity.get("plateNo") == plate_no:
-                return item
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Scrie starea doar dacă felia de date a senzorului s-a schimbat."""
+        amprenta = (self.coordinator.amprenta(self._plate_amprenta), self.available)
+        if (
+            not self._dependent_de_timp
+            and amprenta[0] is not None
+            and amprenta == self._ultima_amprenta
+        ):
+            return
+        self._ultima_amprenta = amprenta
+        super()._handle_coordinator_update()
+
+    def _memo(self, cheie, calcul):
+        """Returnează `calcul()` memorat până când coordinatorul publică o nouă generație de date."""
+        generatie = self.coordinator.generatie
+        if generatie != self._memo_generatie:
+            self._memo_generatie = generatie
+            self._memo_valori = {}
+        if cheie not in self._memo_valori:
+            self._memo_valori[cheie] = calcul()
+        return self._memo_valori[cheie]
+
+    @property
+    def state(self):
+        """Starea senzorului, recalculată doar la o nouă generație de date."""
+        return self._memo("state", self._calc_state)
+
+    @property
+    def extra_state_attributes(self):
+        """Atributele senzorului, recalculate doar la o nouă generație de date."""
+        return self._memo("attributes", self._calc_attributes)
+
+    def _calc_state(self):
+        """Calculează starea senzorului (suprascrisă de subclase)."""
+        return None
+
+    def _calc_attributes(self):
+        """Calculează atributele senzorului (suprascrisă de subclase)."""
         return None
 
+    def _get_current_view_item(self, plate_no: str) -> dict | None:
+        """Returnează obiectul din paginated_data.view pentru placa dată (din index)."""
+        return self.coordinator.view_by_plate.get(plate_no)
+
+    def _get_country_name(self, country_id) -> str:
+        """Returnează denumirea țării pe baza ID-ului (din index)."""
+        if not country_id:
+            return "Necunoscut"
+        country = self.coordinator.tari_by_id.get(country_id)
+        if country is None:
+            return "Necunoscut"
+        country_name = country.get("denumire", "Necunoscut")
+        # Capitalizăm fiecare cuvânt din denumirea țării (opțional)
+        return " ".join(word.capitalize() for word in country_name.split())
+
 
 # -------------------------------------------------------------------
 #                     DateUtilizatorSensor
@@ -241,8 +327,7 @@ class DateUtilizatorSensor(ErovinietaBaseSensor):
             self._attr_entity_id,
         )
 
-    @property
-    def state(self):
+    def _calc_state(self):
         """Returnează starea senzorului (atribut principal)."""
         if not self.coordinator.data or "user_data" not in self.coordinator.data:
             _LOGGER.debug("DateUtilizatorSensor - Nu există date în coordinator.")
@@ -252,8 +337,7 @@ class DateUtilizatorSensor(ErovinietaBaseSensor):
         user_id = user_data.get("id")
         return user_id if user_id is not None else "nespecificat"
 
-    @property
-    def extra_state_attributes(self):
+    def _calc_attributes(self):
         """Returnează atributele suplimentare."""
         if not self.coordinator.data or "user_data" not in self.coordinator.data:
             _LOGGER.debug("DateUtilizatorSensor - Nu există date îny coordinator.")
@@ -304,6 +388,8 @@ class DateUtilizatorSensor(ErovinietaBaseSensor):
 class VehiculSensor(ErovinietaBaseSensor):
     """Senzor pentru un vehicul în sistemul e-Rovinietă."""
 
+    _dependent_de_timp = True  # "Expiră peste (zile)"
+
     def __init__(self, coordinator, config_entry, vehicul_data):
         """Inițializează senzorul pentru un vehicul specific."""
         plate_no = vehicul_data.get("entity", {}).get("plateNo", "Necunoscut")
@@ -317,6 +403,7 @@ class VehiculSensor(ErovinietaBaseSensor):
             unique_id=unique_id,
             entity_id=entity_id,
             icon="mdi:car",
+            plate_no=plate_no,
         )
 
         self.vehicul_data = vehicul_data
@@ -328,57 +415,28 @@ class VehiculSensor(ErovinietaBaseSensor):
             self._attr_entity_id,
         )
 
-        # Transmite datele vehiculului către coordonator pentru utilizare ulterioară
-        vin = vehicul_data.get("entity", {}).get("vin", "Necunoscut")
-        certificate_series = vehicul_data.get("entity", {}).get("certificateSeries", "Necunoscut")
-        self.coordinator.vehicule_data.append({
-            "vin": vin,
-            "plateNo": plate_no,
-            "certificateSeries": certificate_series,
-        })
-        _LOGGER.debug(
-            "VehiculSensor - Date vehicul trimise către coordonator: VIN=%s, PlateNo=%s, CertificateSeries=%s",
-            vin, plate_no, certificate_series
-        )
-
-    @staticmethod
-    def get_country_name(country_id, countries_data):
-        """Returnează denumirea țării pe baza ID-ului."""
-        if not country_id or not countries_data:
-            return "Necunoscut"
-        for country in countries_data:
-            if country.get("id") == country_id:
-                country_name = country.get("denumire", "Necunoscut")
-                # Capitalizăm fiecare cuvânt din denumirea țării (opțional)
-                return " ".join(word.capitalize() for word in country_name.split())
-        return "Necunoscut"
-
     @staticmethod
     def format_timestamp(timestamp_millis):
         """Formatează un timestamp (ms) în ora locală Home Assistant."""
         return format_timestamp(timestamp_millis)
 
-    @property
-    def state(self):
+    def _calc_state(self):
         """Returnează numărul de înmatriculare ca stare principală a senzorului."""
         plate_no = self.vehicul_data.get("entity", {}).get("plateNo", "Necunoscut")
         return plate_no
 
-    @property
-    def extra_state_attributes(self):
+    def _calc_attributes(self):
         """Returnează atributele suplimentare ale senzorului."""
-        entity = self.vehicul_data.get("entity", {})
-        vignettes_list = self.vehicul_data.get("userDetailsVignettes", [])
+        vehicul_data = self._get_current_view_item(self._plate_amprenta) or self.vehicul_data
+        entity = vehicul_data.get("entity", {})
+        vignettes_list = vehicul_data.get("userDetailsVignettes", [])
 
         # Atribute de bază, mereu prezente
         attributes = {
             "Număr de înmatriculare": entity.get("plateNo", "Necunoscut"),
             "VIN": entity.get("vin", "Necunoscut"),
             "Seria certificatului": entity.get("certificateSeries", "Necunoscut"),
-            "Țara": self.get_country_name(
-                entity.get("tara"),
-                self.coordinator.data.get("countries_data", [])
-            ),
+            "Țara": self._get_country_name(entity.get("tara")),
             "attribution": ATTRIBUTION,
         }
 
@@ -448,14 +506,12 @@ class RaportTranzactiiSensor(ErovinietaBaseSensor):
             self._attr_entity_id,
         )
 
-    @property
-    def state(self):
+    def _calc_state(self):
         """Returnează numărul total al tranzacțiilor realizate."""
         tranzactii_data = self.coordinator.data.get("transactions", [])
         return len(tranzactii_data)
 
-    @property
-    def extra_state_attributes(self):
+    def _calc_attributes(self):
         """Returnează atributele suplimentare simplificate."""
         tranzactii_data = self.coordinator.data.get("transactions", [])
         total_sum = sum(
@@ -463,7 +519,7 @@ class RaportTranzactiiSensor(ErovinietaBaseSensor):
         )
 
         # Calculăm perioada analizată
-        years_analyzed = self.coordinator.config_entry.options.get("transaction_history_years", 2)
+        years_analyzed = self.coordinator.istoricul_tranzactiilor
         attributes = {
             "Perioadă analizată": f"Ultimii {years_analyzed} ani",
             "Număr facturi": len(tranzactii_data),
@@ -480,6 +536,8 @@ class RaportTranzactiiSensor(ErovinietaBaseSensor):
 class PlataTreceriPodSensor(ErovinietaBaseSensor):
     """Senzor pentru verificarea plăților pentru treceri de pod (restanțe)."""
 
+    _dependent_de_timp = True  # fereastra de 24h
+
     def __init__(self, coordinator, config_entry, vin, plate_no, certificate_series):
         """Inițializează senzorul PlataTreceriPodSensor."""
         super().__init__(
@@ -489,6 +547,7 @@ class PlataTreceriPodSensor(ErovinietaBaseSensor):
             unique_id=f"{DOMAIN}_plata_treceri_pod_{plate_no.replace(' ', '_').lower()}",
             entity_id=f"sensor.{DOMAIN}_plata_treceri_pod_{plate_no.replace(' ', '_').lower()}",
             icon="mdi:invoice-text-remove",
+            plate_no=plate_no,
         )
         self.vin = vin
         self.plate_no = plate_no
@@ -501,10 +560,9 @@ class PlataTreceriPodSensor(ErovinietaBaseSensor):
             self.plate_no,
         )
 
-    @property
-    def state(self):
+    def _calc_state(self):
         """Returnează starea principală: Da sau Nu (există restanțe?)."""
-        detection_list = self.coordinator.data.get("detectionList", [])
+        detection_list = self.coordinator.detectii_vehicul(self.vin, self.plate_no)
         now = int(datetime.now().timestamp() * 1000)  # Timpul actual în milisecunde
         interval_ms = 24 * 60 * 60 * 1000  # 24 ore în milisecunde
 
@@ -516,10 +574,9 @@ class PlataTreceriPodSensor(ErovinietaBaseSensor):
         ]
         return "Da" if len(neplatite) > 0 else "Nu"
 
-    @property
-    def extra_state_attributes(self):
+    def _calc_attributes(self):
         """Returnează detalii despre trecerile neplătite (restanțe)."""
-        detection_list = self.coordinator.data.get("detectionList", [])
+        detection_list = self.coordinator.detectii_vehicul(self.vin, self.plate_no)
         now = int(datetime.now().timestamp() * 1000)
         interval_ms = 24 * 60 * 60 * 1000  # 24 ore în milisecunde
 
@@ -541,14 +598,9 @@ class PlataTreceriPodSensor(ErovinietaBaseSensor):
         def safe_get(value, default=""):
             return value if value is not None else default
 
-        # Adăugăm fiecare trecere cu detalii
-        for idx, detection in enumerate(neplatite, start=1):
-            timestamp = detection.get("detectionTimestamp")
-            formatted_time = (
-                datetime.fromtimestamp(timestamp / 1000).strftime('%Y-%m-%d %H:%M:%S')
-                if timestamp
-                else ""
-            )
+        # Adăugăm cele mai recente restanțe cu detalii (numărul lor este limitat)
+        for idx, detection in enumerate(treceri_recente(neplatite, TRECERI_POD_ATRIBUTE_MAX), start=1):
+            formatted_time = _format_ts_local(detection.get("detectionTimestamp"))
             # Separator vizual minimal
             attributes[f"--- Restanțe pentru trecerea de pod #{idx}"] = "\n"
             attributes[f"Trecere {idx} - Categorie"] = safe_get(detection.get("detectionCategory"))
@@ -559,6 +611,10 @@ class PlataTreceriPodSensor(ErovinietaBaseSensor):
         attributes["attribution"] = ATTRIBUTION
         return attributes
 
+    async def async_update(self):
+        """Reîmprospătează la cerere (homeassistant.update_entity) doar acest vehicul."""
+        await self.coordinator.async_refresh_vehicul(self.vin, self.plate_no, self.certificate_series)
+
 
 # -------------------------------------------------------------------
 #                Senzor TreceriPodSensor - istoric
@@ -576,6 +632,7 @@ class TreceriPodSensor(ErovinietaBaseSensor):
             unique_id=f"{DOMAIN}_treceri_pod_{plate_no.replace(' ', '_').lower()}_{config_entry.entry_id}",
             entity_id=f"sensor.{DOMAIN}_treceri_pod_{plate_no.replace(' ', '_').lower()}",
             icon="mdi:bridge",
+            plate_no=plate_no,
         )
         self.vin = vin
         self.plate_no = plate_no
@@ -589,25 +646,15 @@ class TreceriPodSensor(ErovinietaBaseSensor):
             self.certificate_series,
         )
 
-    @property
-    def state(self):
+    def _calc_state(self):
         """Returnează numărul total al trecerilor pentru vehicul."""
-        detection_list = [
-            detection
-            for detection in self.coordinator.data.get("detectionList", [])
-            if detection.get("vin") == self.vin and detection.get("plateNo") == self.plate_no
-        ]
+        detection_list = self.coordinator.detectii_vehicul(self.vin, self.plate_no)
         total_treceri = len(detection_list)
         return total_treceri
 
-    @property
-    def extra_state_attributes(self):
+    def _calc_attributes(self):
         """Returnează detalii suplimentare despre treceri."""
-        detection_list = [
-            detection
-            for detection in self.coordinator.data.get("detectionList", [])
-            if detection.get("vin") == self.vin and detection.get("plateNo") == self.plate_no
-        ]
+        detection_list = self.coordinator.detectii_vehicul(self.vin, self.plate_no)
 
         attributes = {
             "Număr total treceri": len(detection_list),
@@ -616,63 +663,41 @@ class TreceriPodSensor(ErovinietaBaseSensor):
             "Seria certificatului": self.certificate_series,
         }
 
-        for idx, detection in enumerate(detection_list, start=1):
-            timestamp = detection.get("detectionTimestamp")
-            formatted_time = (
-                datetime.fromtimestamp(timestamp / 1000).strftime('%Y-%m-%d %H:%M:%S')
-                if timestamp
-                else ""
-            )
-            # Separator vizual minimal
-            attributes[f"--- Detalii privind trecerea de pod #{idx}"] = "\n"
-            attributes[f"Trecere {idx} - Categorie"] = detection.get("detectionCategory") or ""
-            attributes[f"Trecere {idx} - Timp detectare"] = formatted_time
-            attributes[f"Trecere {idx} - Direcție"] = detection.get("direction") or ""
-            attributes[f"Trecere {idx} - Bandă"] = detection.get("lane") or ""
-            attributes[f"Trecere {idx} - Valoare (RON)"] = detection.get("value") or ""
-            attributes[f"Trecere {idx} - Partener"] = detection.get("partner") or ""
-            attributes[f"Trecere {idx} - Metodă plată"] = detection.get("paymentMethod") or ""
-            attributes[f"Trecere {idx} - Vehicul"] = detection.get("paymentPlateNo") or ""
-            attributes[f"Trecere {idx} - Treceri achiziționate"] = detection.get("taxName") or ""
-            valid_until_timestamp = detection.get("validUntilTimestamp")
-            formatted_valid_until = (
-                datetime.fromtimestamp(valid_until_timestamp / 1000).strftime('%Y-%m-%d %H:%M:%S')
-                if valid_until_timestamp
-                else ""
-            )
-            attributes[f"Trecere {idx} - Valabilitate până la"] = formatted_valid_until
+        # Doar agregate și cele mai recente treceri: atributele rămân mici indiferent de
+        # istoric. Lista completă: serviciul erovinieta.istoric_treceri_pod.
+        recente = treceri_recente(detection_list, TRECERI_POD_ATRIBUTE_MAX)
+        attributes["Treceri neplătite"] = sum(
+            1 for detection in detection_list if detection.get("paymentStatus") is None
+        )
+        valoare_totala = 0.0
+        for detection in detection_list:
+            try:
+                valoare_totala += float(detection.get("value") or 0)
+            except (TypeError, ValueError):
+                continue
+        attributes["Valoare totală (RON)"] = round(valoare_totala, 2)
+        attributes["Ultima trecere"] = (
+            _format_ts_local(recente[0].get("detectionTimestamp")) if recente else ""
+        )
+        attributes["Treceri afișate"] = len(recente)
+        attributes["Treceri recente"] = [formateaza_trecere(detection) for detection in recente]
 
         attributes["attribution"] = ATTRIBUTION
         return attributes
 
     async def async_update(self):
-        """Actualizează manual datele pentru senzor (opțional, când se cheamă explicit)."""
+        """Reîmprospătează la cerere (homeassistant.update_entity) doar acest vehicul."""
         _LOGGER.debug(
             "Actualizăm manual datele pentru TreceriPodSensor: vin=%s, plate_no=%s, certificate_series=%s",
             self.vin,
             self.plate_no,
             self.certificate_series,
         )
-        try:
-            treceri_pod_data = await self.coordinator.hass.async_add_executor_job(
-                self.coordinator.api.get_treceri_pod,
-                self.vin,
-                self.plate_no,
-                self.certificate_series,
-            )
-            # Actualizăm datele în coordinator
-            self.coordinator.data["detectionList"] = treceri_pod_data.get("detectionList", [])
+        if await self.coordinator.async_refresh_vehicul(self.vin, self.plate_no, self.certificate_series):
             _LOGGER.info(
                 "Datele pentru TreceriPodSensor au fost actualizate cu succes pentru vehiculul %s.",
                 self.plate_no,
             )
-        except Exception as e:
-            _LOGGER.error(
-                "Eroare la actualizarea datelor pentru TreceriPodSensor: vin=%s, plate_no=%s, error=%s",
-                self.vin,
-                self.plate_no,
-                e,
-            )
 
 
 # -------------------------------------------------------------------
@@ -693,6 +718,7 @@ class SoldSensor(ErovinietaBaseSensor):
             unique_id=f"{DOMAIN}_sold_peaje_neexpirate_{sanitized_plate_no}_{config_entry.entry_id}",
             entity_id=f"sensor.{DOMAIN}_sold_peaje_neexpirate_{sanitized_plate_no}",
             icon="mdi:boom-gate",
+            plate_no=plate_no,
         )
         self.plate_no = plate_no
         _LOGGER.debug(
@@ -702,55 +728,39 @@ class SoldSensor(ErovinietaBaseSensor):
             self.plate_no,
         )
 
-    @property
-    def state(self):
+    def _calc_state(self):
         """Returnează valoarea principală: soldPeajeNeexpirate."""
-        paginated_data = self.coordinator.data.get("paginated_data", {}).get("view", [])
-        if not paginated_data:
+        if not self.coordinator.view_by_plate:
             _LOGGER.warning("Nu există date paginate pentru sold.")
             return 0
 
-        try:
-            for item in paginated_data:
-                entity = item.get("entity", {})
-                if entity and entity.get("plateNo") == self.plate_no:
-                    detection_payment_sum = item.get("detectionPaymentSum", {})
-                    if detection_payment_sum:
-                        return detection_payment_sum.get("soldPeajeNeexpirate", 0)
-            _LOGGER.info("Nu s-a găsit sold pentru numărul de înmatriculare: %s", self.plate_no)
-            return 0
-        except Exception as e:
-            _LOGGER.error("Eroare la obținerea soldului pentru %s: %s", self.plate_no, e)
-            return 0
+        item = self._get_current_view_item(self.plate_no)
+        detection_payment_sum = (item or {}).get("detectionPaymentSum") or {}
+        if detection_payment_sum:
+            return detection_payment_sum.get("soldPeajeNeexpirate", 0)
+        _LOGGER.info("Nu s-a găsit sold pentru numărul de înmatriculare: %s", self.plate_no)
+        return 0
 
-    @property
-    def extra_state_attributes(self):
+    def _calc_attributes(self):
         """Returnează atributele suplimentare ale senzorului."""
-        paginated_data = self.coordinator.data.get("paginated_data", {}).get("view", [])
         attributes = {"attribution": ATTRIBUTION}
 
-        if not paginated_data:
+        if not self.coordinator.view_by_plate:
             _LOGGER.info("Nu există date paginate pentru configurarea atributelor.")
             attributes.update({
                 "Sold Peaje Neexpirate": 0,
             })
             return attributes
 
-        try:
-            for item in paginated_data:
-                entity = item.get("entity", {})
-                if entity and entity.get("plateNo") == self.plate_no:
-                    detection_payment_sum = item.get("detectionPaymentSum", {})
-                    if detection_payment_sum:
-                        attributes.update({
-                            "Sold peaje neexpirate": detection_payment_sum.get("soldPeajeNeexpirate", 0),
-                        })
-                        return attributes
-
-            _LOGGER.info("Nu s-au găsit atribute pentru numărul de înmatriculare: %s", self.plate_no)
-        except Exception as e:
-            _LOGGER.error("Eroare la configurarea atributelor suplimentare pentru %s: %s", self.plate_no, e)
+        item = self._get_current_view_item(self.plate_no)
+        detection_payment_sum = (item or {}).get("detectionPaymentSum") or {}
+        if detection_payment_sum:
+            attributes.update({
+                "Sold peaje neexpirate": detection_payment_sum.get("soldPeajeNeexpirate", 0),
+            })
+            return attributes
 
+        _LOGGER.info("Nu s-au găsit atribute pentru numărul de înmatriculare: %s", self.plate_no)
         # Atribute implicite dacă nu există date relevante
         attributes.update({
             "Sold peaje neexpirate": 0,
@@ -771,11 +781,11 @@ class VINSensor(ErovinietaBaseSensor):
             unique_id=f"{DOMAIN}_vin_{plate_slug}",
             entity_id=f"sensor.{DOMAIN}_vin_{plate_slug}",
             icon="mdi:barcode",
+            plate_no=plate,
         )
         self._plate = plate
 
-    @property
-    def state(self):
+    def _calc_state(self):
         item = self._get_current_view_item(self._plate)
         return (item or {}).get("entity", {}).get("vin") or "N/A"
 
@@ -792,11 +802,11 @@ class CertificateSeriesSensor(ErovinietaBaseSensor):
             unique_id=f"{DOMAIN}_seria_certificat_{plate_slug}",
             entity_id=f"sensor.{DOMAIN}_seria_certificat_{plate_slug}",
             icon="mdi:certificate",
+            plate_no=plate,
         )
         self._plate = plate
 
-    @property
-    def state(self):
+    def _calc_state(self):
         item = self._get_current_view_item(self._plate)
         return (item or {}).get("entity", {}).get("certificateSeries") or "N/A"
 
@@ -813,14 +823,14 @@ class CountrySensor(ErovinietaBaseSensor):
             unique_id=f"{DOMAIN}_tara_{plate_slug}",
             entity_id=f"sensor.{DOMAIN}_tara_{plate_slug}",
             icon="mdi:earth",
+            plate_no=plate,
         )
         self._plate = plate
 
-    @property
-    def state(self):
+    def _calc_state(self):
         item = self._get_current_view_item(self._plate)
         cid = (item or {}).get("entity", {}).get("tara")
-        return VehiculSensor.get_country_name(cid, self.coordinator.data.get("countries_data", [])) or "N/A"
+        return self._get_country_name(cid) or "N/A"
 
 
 
@@ -835,11 +845,11 @@ class VignetteCategorySensor(ErovinietaBaseSensor):
             unique_id=f"{DOMAIN}_categorie_vignieta_{plate_slug}",
             entity_id=f"sensor.{DOMAIN}_categorie_vignieta_{plate_slug}",
             icon="mdi:ticket",
+            plate_no=plate,
         )
         self._plate = plate
 
-    @property
-    def state(self):
+    def _calc_state(self):
         item = self._get_current_view_item(self._plate)
         vigs = (item or {}).get('userDetailsVignettes') or []
         return (vigs[0].get('vignetteCategory') if vigs else None) or 'N/A'
@@ -856,11 +866,11 @@ class VignetteStartDateSensor(ErovinietaBaseSensor):
             unique_id=f"{DOMAIN}_start_vignieta_{plate_slug}",
             entity_id=f"sensor.{DOMAIN}_start_vignieta_{plate_slug}",
             icon="mdi:calendar-start",
+            plate_no=plate,
         )
         self._plate = plate
 
-    @property
-    def state(self):
+    def _calc_state(self):
         """Returnează data începerii sau 'N/A' dacă nu există."""
         item = self._get_current_view_item(self._plate)
         vigs = (item or {}).get('userDetailsVignettes') or []
@@ -875,13 +885,158 @@ class VignetteEndDateSensor(ErovinietaBaseSensor):
         name = f"End vignietă {plate}"
         uid  = f"{DOMAIN}_end_vignieta_{plate_slug}"
         eid  = f"sensor.{DOMAIN}_end_vignieta_{plate_slug}"
-        super().__init__(coordinator, config_entry, name, uid, eid, icon="mdi:calendar-end")
+        super().__init__(coordinator, config_entry, name, uid, eid, icon="mdi:calendar-end", plate_no=plate)
         self._plate = plate
 
-    @property
-    def state(self):
+    def _calc_state(self):
         item = self._get_current_view_item(self._plate)
         vigs = (item or {}).get("userDetailsVignettes") or []
         ts = (vigs[0].get("vignetteStopDate") if vigs else None)
         return format_timestamp(ts)
 
+
+# -------------------------------------------------------------------
+#                     StarePortalSensor (diagnostic)
+# -------------------------------------------------------------------
+class StarePortalSensor(ErovinietaBaseSensor):
+    """Starea întrerupătorului de circuit al conexiunii cu portalul."""
+
+    # starea întrerupătorului se schimbă independent de datele vehiculelor
+    _dependent_de_timp = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, config_entry):
+        """Inițializează senzorul StarePortalSensor."""
+        super().__init__(
+            coordinator,
+            config_entry,
+            name="Stare portal",
+            unique_id=f"{DOMAIN}_stare_portal_{config_entry.entry_id}",
+            entity_id=f"sensor.{DOMAIN}_stare_portal_{slugify(config_entry.entry_id)}",
+            icon="mdi:lan-check",
+        )
+
+    @property
+    def available(self):
+        """Senzorul rămâne disponibil tocmai când portalul nu răspunde."""
+        return True
+
+    def _calc_state(self):
+        """Returnează starea întrerupătorului: inchis, deschis sau semideschis."""
+        return self.coordinator.api.intrerupator.stare
+
+    def _calc_attributes(self):
+        """Returnează detaliile întrerupătorului și ale reîncercărilor."""
+        intrerupator = self.coordinator.api.intrerupator
+        proba = intrerupator.secunde_pana_la_proba()
+        return {
+            "Erori consecutive": intrerupator.erori_consecutive,
+            "Ultima eroare": intrerupator.ultima_eroare or "",
+            "Deschideri": intrerupator.deschideri,
+            "Reîncercări": self.coordinator.api.metrici.reincercari,
+            "Probă peste (secunde)": round(proba) if proba is not None else "",
+            "attribution": ATTRIBUTION,
+        }
+
+
+# -------------------------------------------------------------------
+#                     Metrici (diagnostic)
+# -------------------------------------------------------------------
+class DurataActualizareSensor(ErovinietaBaseSensor):
+    """Durata ultimei actualizări, cu histogramele pe etape în atribute."""
+
+    _dependent_de_timp = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = "s"
+
+    def __init__(self, coordinator, config_entry):
+        """Inițializează senzorul DurataActualizareSensor."""
+        super().__init__(
+            coordinator,
+            config_entry,
+            name="Durată actualizare",
+            unique_id=f"{DOMAIN}_durata_actualizare_{config_entry.entry_id}",
+            entity_id=f"sensor.{DOMAIN}_durata_actualizare_{slugify(config_entry.entry_id)}",
+            icon="mdi:timer-outline",
+        )
+
+    @property
+    def unit_of_measurement(self):
+        """Unitatea de măsură (secunde)."""
+        return self._attr_native_unit_of_measurement
+
+    def _calc_state(self):
+        """Returnează durata ultimei actualizări, în secunde."""
+        histograma = self.coordinator.api.metrici.durate.get("actualizare")
+        return round(histograma.ultima, 2) if histograma else None
+
+    def _calc_attributes(self):
+        """Returnează histogramele de durată pe etape (autentificare, vehicule, treceri etc.)."""
+        return {
+            etapa: histograma.ca_dict()
+            for etapa, histograma in sorted(self.coordinator.api.metrici.durate.items())
+        }
+
+
+class CereriPortalSensor(ErovinietaBaseSensor):
+    """Numărul total de cereri trimise portalului, cu detalierea în atribute."""
+
+    _dependent_de_timp = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, config_entry):
+        """Inițializează senzorul CereriPortalSensor."""
+        super().__init__(
+            coordinator,
+            config_entry,
+            name="Cereri portal",
+            unique_id=f"{DOMAIN}_cereri_portal_{config_entry.entry_id}",
+            entity_id=f"sensor.{DOMAIN}_cereri_portal_{slugify(config_entry.entry_id)}",
+            icon="mdi:counter",
+        )
+
+    def _calc_state(self):
+        """Returnează numărul total de cereri de la pornire."""
+        return sum(self.coordinator.api.metrici.cereri.values())
+
+    def _calc_attributes(self):
+        """Returnează cererile pe endpoint, octeții primiți, reîncercările și autentificările."""
+        metrici = self.coordinator.api.metrici
+        return {
+            "Cereri pe endpoint": dict(metrici.cereri),
+            "Octeți primiți": metrici.octeti_primiti,
+            "Reîncercări": metrici.reincercari,
+            "Autentificări": metrici.autentificari,
+            "Reautentificări": metrici.reautentificari,
+            "Actualizări incomplete": metrici.actualizari_incomplete,
+            "Cache": dict(self.coordinator.api.cache_stats),
+        }
+
+
+class UltimaActualizareSensor(ErovinietaBaseSensor):
+    """Momentul ultimei actualizări reușite a datelor."""
+
+    _dependent_de_timp = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    def __init__(self, coordinator, config_entry):
+        """Inițializează senzorul UltimaActualizareSensor."""
+        super().__init__(
+            coordinator,
+            config_entry,
+            name="Ultima actualizare reușită",
+            unique_id=f"{DOMAIN}_ultima_actualizare_{config_entry.entry_id}",
+            entity_id=f"sensor.{DOMAIN}_ultima_actualizare_{slugify(config_entry.entry_id)}",
+            icon="mdi:clock-check-outline",
+        )
+
+    @property
+    def available(self):
+        """Rămâne disponibil și când actualizările eșuează (tocmai atunci e util)."""
+        return True
+
+    def _calc_state(self):
+        """Returnează momentul ultimei actualizări reușite (ISO 8601), dacă există."""
+        ultimul_succes = self.coordinator.api.metrici.ultimul_succes
+        return ultimul_succes.isoformat() if ultimul_succes else None
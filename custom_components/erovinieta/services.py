@@ -0,0 +1,54 @@
+"""Servicii pentru integrarea CNAIR eRovinieta."""
+
+from __future__ import annotations
+
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN, SERVICE_ISTORIC_TRECERI_POD, ATTR_NUMAR_INMATRICULARE
+
+_LOGGER = logging.getLogger(__name__)
+
+ISTORIC_TRECERI_POD_SCHEMA = vol.Schema({
+    vol.Required(ATTR_NUMAR_INMATRICULARE): cv.string,
+})
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Înregistrează serviciile integrării (o singură dată, la nivel de domeniu)."""
+
+    async def async_istoric_treceri_pod(call: ServiceCall) -> ServiceResponse:
+        """Returnează istoricul complet al trecerilor de pod pentru un vehicul."""
+        from .sensor import formateaza_trecere, treceri_recente
+
+        plate_no = call.data[ATTR_NUMAR_INMATRICULARE]
+        for entry_data in hass.data.get(DOMAIN, {}).values():
+            coordinator = entry_data.get("coordinator") if isinstance(entry_data, dict) else None
+            if coordinator is None or plate_no not in coordinator.view_by_plate:
+                continue
+
+            vin = (coordinator.view_by_plate[plate_no].get("entity") or {}).get("vin")
+            detection_list = treceri_recente(coordinator.detectii_vehicul(vin, plate_no))
+            _LOGGER.debug("Istoric treceri pod pentru %s: %d treceri.", plate_no, len(detection_list))
+            return {
+                "numar_inmatriculare": plate_no,
+                "vin": vin,
+                "total": len(detection_list),
+                "treceri": [formateaza_trecere(detection) for detection in detection_list],
+            }
+
+        raise ServiceValidationError(f"Vehiculul cu numărul {plate_no} nu a fost găsit.")
+
+    if not hass.services.has_service(DOMAIN, SERVICE_ISTORIC_TRECERI_POD):
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_ISTORIC_TRECERI_POD,
+            async_istoric_treceri_pod,
+            schema=ISTORIC_TRECERI_POD_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )